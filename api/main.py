@@ -31,7 +31,13 @@ Development (with auto-reload):
     uvicorn api.main:app --reload --port 8000
 
 Production:
-    uvicorn api.main:app --host 0.0.0.0 --port 8000 --workers 4
+    uvicorn api.main:app --host 0.0.0.0 --port 8000 --workers 4 \\
+        --loop uvloop --http httptools
+
+    uvicorn[standard] ships uvloop (libuv event loop, ~2x the RPS of
+    stock asyncio on auth-dominated endpoints) and httptools (C HTTP
+    parser). Auto-detection already prefers them when installed; the
+    explicit flags just make the fast path visible and guarantee it.
 
 Then visit:
     http://localhost:8000/docs - Swagger UI (interactive docs)
@@ -110,6 +116,38 @@ async def lifespan(app: FastAPI):
         print("  ⚠️  WARNING: Using default SECRET_KEY! Generate a secure one:")
         print("     openssl rand -hex 32")
 
+    # Widen the anyio threadpool that serves run_in_threadpool. The
+    # default of 40 tokens is shared with sync endpoints and file I/O;
+    # bcrypt verifications park a thread for ~100ms each, so under
+    # login bursts they can starve the pool. 64 tokens keeps logins
+    # from queueing behind each other (threads are cheap; the bcrypt C
+    # code releases the GIL while hashing).
+    try:
+        import anyio.to_thread
+        anyio.to_thread.current_default_thread_limiter().total_tokens = 64
+    except Exception as e:
+        print(f"  WARNING: Could not resize thread limiter: {e}")
+
+    # Warm lazy auth state in the background: in dev mode the admin
+    # singleton bcrypt-hashes the default password on first use, which
+    # would otherwise add ~100-300ms to the first login
+    import asyncio
+    from starlette.concurrency import run_in_threadpool
+    from src.auth.dependencies import warm_auth_caches
+    asyncio.get_running_loop().create_task(run_in_threadpool(warm_auth_caches))
+
+    # Pre-build the multi-agent system so the first request doesn't pay
+    # the cold-start cost (agent construction, tool schema validation,
+    # prompt compilation). With a preforking server (--preload) the built
+    # structures are shared with workers via copy-on-write.
+    if api_keys['openai'] or api_keys['mistral']:
+        try:
+            from src.agents.orchestrator import get_multi_agent_system
+            get_multi_agent_system()
+            print("  Multi-agent system pre-warmed")
+        except Exception as e:
+            print(f"  WARNING: Could not pre-build multi-agent system: {e}")
+
     print("=" * 60)
     print("API is ready! Visit http://localhost:8000/docs for Swagger UI")
     print("=" * 60)
@@ -121,6 +159,11 @@ async def lifespan(app: FastAPI):
     print("VISION PLATFORM API - SHUTTING DOWN")
     print("=" * 60)
 
+    # Close the shared LLM HTTP client while the event loop still runs,
+    # so pooled connections shut down cleanly instead of being abandoned
+    from src.agents._llm_registry import close_shared_async_client
+    await close_shared_async_client()
+
 
 # === CREATE THE FASTAPI APP ===
 
@@ -185,6 +228,24 @@ app.add_middleware(
 )
 
 
+# Public-path flag middleware
+@app.middleware("http")
+async def mark_public_paths(request: Request, call_next: Callable):
+    """
+    Middleware that classifies the request path ONCE per request.
+
+    Several auth dependencies (get_current_user, verify_api_key,
+    require_auth) can run for the same request, and each used to do its
+    own public-path membership check. Doing it once here and stashing
+    the result on request.state means the dependencies just read a
+    precomputed bool.
+    """
+    from src.auth.dependencies import is_public_path
+
+    request.state.is_public = is_public_path(request.url.path)
+    return await call_next(request)
+
+
 # Request timing middleware
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next: Callable):
@@ -351,5 +412,9 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True,  # Auto-reload on code changes
-        log_level="info"
+        log_level="info",
+        # uvloop + httptools come with uvicorn[standard]; "auto" picks
+        # them up where available and falls back cleanly elsewhere
+        loop="auto",
+        http="auto",
     )
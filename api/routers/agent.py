@@ -115,8 +115,9 @@ async def chat_with_agent(
             "context": {},
         }
 
-        # Invoke the multi-agent system
-        result = agent.invoke(
+        # Invoke the multi-agent system (async so the event loop stays free
+        # for other requests while the LLM providers respond)
+        result = await agent.ainvoke(
             initial_state,
             config={"configurable": {"thread_id": thread_id}}
         )
@@ -189,8 +190,9 @@ async def stream_agent_response(
                     "context": {},
                 }
 
-                # Stream the agent response
-                for event in agent.stream(
+                # Stream the agent response (async iteration keeps the
+                # event loop free between chunks)
+                async for event in agent.astream(
                     initial_state,
                     config={"configurable": {"thread_id": thread_id}},
                     stream_mode="values"
@@ -173,6 +173,14 @@ class Settings(BaseSettings):
     # Token expiration time in minutes (default: 30 minutes)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # bcrypt work factor: each +1 doubles hash time. 12 (~100-300ms) is
+    # the interactive-login standard; lower only for dev/test where the
+    # deliberate slowness just wastes wall-clock time.
+    BCRYPT_ROUNDS: int = Field(
+        default=12,
+        description="bcrypt cost factor for password hashing (4-31)"
+    )
+
     # API Key for simple authentication (alternative to JWT)
     # Can be used for service-to-service communication
     API_KEY: Optional[str] = Field(
@@ -180,6 +188,14 @@ class Settings(BaseSettings):
         description="Static API key for simple authentication"
     )
 
+    # Pepper for API key hashing (HMAC key). Unlike passwords, API keys
+    # are random 256-bit secrets, so a single HMAC-SHA256 suffices - the
+    # pepper just keeps a leaked hash table useless without the .env.
+    API_KEY_PEPPER: str = Field(
+        default="CHANGE_ME_API_KEY_PEPPER",
+        description="HMAC pepper for API key hashing - generate with: openssl rand -hex 32"
+    )
+
     # Admin credentials (stored in .env)
     # These are the default admin user credentials
     ADMIN_USERNAME: str = Field(
@@ -0,0 +1,135 @@
+"""
+Shared LLM Registry - One Chat Model Instance Per Configuration
+
+Each agent module used to build its own chat model (`ChatOpenAI`,
+`ChatMistralAI`, ...) even when two agents asked for the exact same
+configuration. Every duplicate instance means:
+  1. A duplicate HTTP client (connection pool, retry state) ~50ms setup
+  2. A duplicate tokenizer load (~10MB each)
+  3. No connection reuse between agents talking to the same provider
+
+This registry hands out ONE instance per (provider, model, kwargs)
+combination, so identical configurations share a client and its
+connection pool automatically.
+
+Usage:
+    from src.agents._llm_registry import get_llm
+
+    llm = get_llm("mistral", "mistral-large-latest", temperature=0.1, api_key=key)
+
+Same pattern as the client singletons in src/clients/, generalized to
+keyed configurations instead of a single global.
+"""
+
+from typing import Dict
+
+
+# Registry of built chat models, keyed by (provider, model, frozenset(kwargs))
+_LLM_REGISTRY: Dict[tuple, object] = {}
+
+# Shared async HTTP client for chat models that accept a pre-built
+# client with absolute request URLs (currently OpenAI). Without it,
+# each chat model owns a private httpx client, so concurrent agents
+# re-do TLS handshakes instead of multiplexing over warm HTTP/2
+# connections to the same provider.
+_shared_async_client = None
+
+
+def get_shared_async_client():
+    """
+    Get or create the shared httpx.AsyncClient used by all chat models.
+
+    HTTP/2 lets many in-flight requests share one connection, and the
+    keep-alive pool skips TLS setup (~20-80ms) on every call after warmup.
+    """
+    global _shared_async_client
+
+    if _shared_async_client is None:
+        import httpx
+        _shared_async_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=50,
+            ),
+        )
+
+    return _shared_async_client
+
+
+async def close_shared_async_client() -> None:
+    """Close the shared HTTP client (call from app shutdown/lifespan)."""
+    global _shared_async_client
+
+    if _shared_async_client is not None:
+        await _shared_async_client.aclose()
+        _shared_async_client = None
+
+
+def get_llm(provider: str, model: str, **kwargs):
+    """
+    Get or create a chat model for the given configuration.
+
+    Identical (provider, model, kwargs) combinations always return the
+    SAME instance, so agents share HTTP clients and tokenizers.
+
+    Args:
+        provider: "openai", "mistral", or "groq"
+        model: Model name (e.g. "gpt-4o-mini", "mistral-large-latest")
+        **kwargs: Passed to the chat model constructor (temperature, api_key, ...)
+
+    Returns:
+        The shared chat model instance for this configuration
+
+    Raises:
+        ValueError: If the provider is not supported
+    """
+    key = (provider, model, frozenset(kwargs.items()))
+
+    llm = _LLM_REGISTRY.get(key)
+    if llm is None:
+        llm = _build_llm(provider, model, **kwargs)
+        _LLM_REGISTRY[key] = llm
+
+    return llm
+
+
+def _build_llm(provider: str, model: str, **kwargs):
+    """
+    Build a new chat model instance for the given provider.
+
+    Provider imports are deferred so only the active provider's
+    LangChain integration is loaded.
+    """
+    if provider == "openai":
+        from langchain_openai import ChatOpenAI
+        return ChatOpenAI(
+            model=model,
+            http_async_client=get_shared_async_client(),
+            **kwargs,
+        )
+
+    elif provider == "mistral":
+        from langchain_mistralai import ChatMistralAI
+        # No shared-client injection here: ChatMistralAI posts to the
+        # relative URL "/chat/completions" and only configures base_url
+        # and the Authorization header on the client IT builds - an
+        # injected bare client makes every ainvoke fail with
+        # httpx.UnsupportedProtocol. Registry-level instance sharing
+        # still applies, so agents with the same config reuse one
+        # client (and its pool) anyway.
+        return ChatMistralAI(
+            model=model,
+            **kwargs,
+        )
+
+    elif provider == "groq":
+        from langchain_groq import ChatGroq
+        return ChatGroq(model=model, **kwargs)
+
+    raise ValueError(f"Unknown LLM provider: {provider}")
+
+
+def reset_llm_registry() -> None:
+    """Clear all cached chat models (useful for testing or config changes)."""
+    _LLM_REGISTRY.clear()
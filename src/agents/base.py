@@ -20,6 +20,34 @@ from langchain_core.messages import BaseMessage
 from langgraph.graph.message import add_messages
 
 
+def keep_last(left, right):
+    """
+    Last-wins reducer for scalar state keys.
+
+    During a "both" fan-out the two specialists run in the same
+    super-step and each writes current_agent; without a reducer
+    LangGraph rejects the concurrent writes with InvalidUpdateError.
+    The keys are informational (which agent touched the state last),
+    so whichever write lands last is fine.
+    """
+    return right
+
+
+def merge_context(left: dict, right: dict) -> dict:
+    """
+    Reducer for the shared context dict.
+
+    Lets nodes return only the context keys they changed (a delta) and
+    have LangGraph merge them into the accumulated context, instead of
+    every node copying the full state with {**state, ...} spreads.
+    """
+    if not right:
+        return left
+    if not left:
+        return right
+    return {**left, **right}
+
+
 class AgentState(TypedDict):
     """
     Shared state for the multi-agent system.
@@ -37,13 +65,18 @@ class AgentState(TypedDict):
     # Messages with automatic merging (LangGraph pattern)
     messages: Annotated[Sequence[BaseMessage], add_messages]
 
-    # Routing information
+    # Routing information. current_agent (and defensively task_type)
+    # can receive parallel writes when the supervisor fans out to both
+    # specialists, so they take the last-wins reducer.
     next_agent: str  # "document", "video", "supervisor", "FINISH"
-    current_agent: str
+    current_agent: Annotated[str, keep_last]
 
     # Task context
-    task_type: Literal["document", "video", "general", "unknown"]
-    context: dict  # Accumulated results from agents
+    task_type: Annotated[
+        Literal["document", "video", "general", "unknown"], keep_last
+    ]
+    # Accumulated results from agents (merged via reducer, nodes return deltas)
+    context: Annotated[dict, merge_context]
 
 
 # Agent names for routing
@@ -30,14 +30,17 @@ NOTE: create_react_agent from langgraph.prebuilt is DEPRECATED.
 """
 
 import os
+import threading
 from typing import Literal
 
-from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
-from langchain_mistralai import ChatMistralAI
-from langchain_openai import ChatOpenAI
-from langchain.agents import create_agent
+# NOTE: Heavy LangChain imports (create_agent, provider chat models) are
+# deferred to the functions that need them. Importing this module only pulls
+# in langchain_core, which keeps cold start fast for scripts that never
+# build the agent (provider clients load lazily via the LLM registry).
+from langchain_core.messages import AIMessage, HumanMessage
 
 from .base import AgentState
+from ._llm_registry import get_llm
 from src.tools.mistral_ocr_tools import MISTRAL_OCR_TOOLS
 from config.settings import settings
 
@@ -87,8 +90,9 @@ def get_document_llm():
         api_key = os.getenv("MISTRAL_API_KEY")
         if api_key and api_key != "your_mistral_api_key_here":
             print(f"[DocumentAgent] Using {model} (Mistral) - OCR synergy")
-            return ChatMistralAI(
-                model=model,
+            return get_llm(
+                "mistral",
+                model,
                 temperature=temperature,
                 api_key=api_key,
             )
@@ -97,8 +101,9 @@ def get_document_llm():
         api_key = os.getenv("OPENAI_API_KEY")
         if api_key:
             print(f"[DocumentAgent] Using {model} (OpenAI)")
-            return ChatOpenAI(
-                model=model,
+            return get_llm(
+                "openai",
+                model,
                 temperature=temperature,
                 api_key=api_key,
             )
@@ -107,8 +112,9 @@ def get_document_llm():
     api_key = os.getenv("MISTRAL_API_KEY")
     if api_key and api_key != "your_mistral_api_key_here":
         print("[DocumentAgent] Fallback to mistral-large-latest")
-        return ChatMistralAI(
-            model="mistral-large-latest",
+        return get_llm(
+            "mistral",
+            "mistral-large-latest",
             temperature=0.1,
             api_key=api_key,
         )
@@ -117,8 +123,9 @@ def get_document_llm():
     api_key = os.getenv("OPENAI_API_KEY")
     if api_key:
         print("[DocumentAgent] Fallback to gpt-4o (OpenAI)")
-        return ChatOpenAI(
-            model="gpt-4o",
+        return get_llm(
+            "openai",
+            "gpt-4o",
             temperature=0.1,
             api_key=api_key,
         )
@@ -128,6 +135,7 @@ def get_document_llm():
 
 # Singleton for the internal document agent
 _document_agent = None
+_document_agent_lock = threading.Lock()
 
 
 def get_document_agent():
@@ -141,22 +149,28 @@ def get_document_agent():
     """
     global _document_agent
 
+    # Double-checked locking: the fast path stays lock-free once built
     if _document_agent is None:
-        llm = get_document_llm()
-        _document_agent = create_agent(
-            model=llm,
-            tools=MISTRAL_OCR_TOOLS,
-            system_prompt=DOCUMENT_AGENT_PROMPT,
-        )
+        with _document_agent_lock:
+            if _document_agent is None:
+                from langchain.agents import create_agent
+
+                llm = get_document_llm()
+                _document_agent = create_agent(
+                    model=llm,
+                    tools=MISTRAL_OCR_TOOLS,
+                    system_prompt=DOCUMENT_AGENT_PROMPT,
+                )
 
     return _document_agent
 
 
-def document_agent_node(state: AgentState) -> AgentState:
+async def document_agent_node(state: AgentState) -> AgentState:
     """
     Document Agent node for the multi-agent graph.
 
     This wraps the agent to work within the supervisor system.
+    Async so the internal agent's LLM calls don't block the event loop.
 
     Args:
         state: Current AgentState from the supervisor
@@ -175,36 +189,46 @@ def document_agent_node(state: AgentState) -> AgentState:
         response_message = AIMessage(
             content="I'm the Document Intelligence Agent. Please provide a document to process or ask about my capabilities."
         )
+        # Return only the delta - LangGraph merges it into the state
         return {
-            **state,
             "messages": [response_message],
             "current_agent": "document_agent",
         }
 
     # Invoke the agent with the messages
     try:
-        result = agent.invoke({
-            "messages": messages
+        # Reuse earlier extraction results accumulated in this thread's
+        # context: follow-up questions ("what's the total?") can then be
+        # answered from the prior OCR output instead of re-running OCR
+        # (and re-serializing the text through another tool round-trip)
+        prior_result = state.get("context", {}).get("document_result")
+        agent_input = list(messages)
+        if prior_result:
+            agent_input.insert(0, AIMessage(
+                content=f"Previously extracted document content:\n{prior_result}"
+            ))
+
+        result = await agent.ainvoke({
+            "messages": agent_input
         })
 
         # Extract the response messages
         response_messages = result.get("messages", [])
 
         # Get the last AI message as the response
-        ai_messages = [m for m in response_messages if isinstance(m, AIMessage)]
-        if ai_messages:
-            final_response = ai_messages[-1]
-        else:
-            final_response = AIMessage(content="Document processing completed.")
+        # Scan from the end so we stop at the first hit instead of
+        # building an intermediate list of every AI message in the trace
+        final_response = next(
+            (m for m in reversed(response_messages) if isinstance(m, AIMessage)),
+            AIMessage(content="Document processing completed.")
+        )
 
+        # Return only the delta - the messages and context reducers in
+        # AgentState merge it, so no full state copy happens per node
         return {
-            **state,
             "messages": [final_response],
             "current_agent": "document_agent",
-            "context": {
-                **state.get("context", {}),
-                "document_result": final_response.content
-            }
+            "context": {"document_result": final_response.content},
         }
 
     except Exception as e:
@@ -212,7 +236,6 @@ def document_agent_node(state: AgentState) -> AgentState:
             content=f"Document processing error: {str(e)}. Please ensure the file path is correct and the file exists."
         )
         return {
-            **state,
             "messages": [error_message],
             "current_agent": "document_agent",
         }
@@ -229,6 +252,7 @@ def create_standalone_document_agent(use_memory: bool = True):
     Returns:
         Compiled LangGraph agent
     """
+    from langchain.agents import create_agent
     from langgraph.checkpoint.memory import MemorySaver
 
     llm = get_document_llm()
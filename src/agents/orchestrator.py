@@ -50,7 +50,9 @@ Usage:
     )
 """
 
-from typing import Optional
+import asyncio
+import threading
+from typing import AsyncIterator, Optional
 from langchain_core.messages import HumanMessage
 
 from .supervisor import build_supervisor_graph
@@ -62,6 +64,10 @@ from .base import AgentState
 # Singleton for the multi-agent system
 _multi_agent_system = None
 
+# Guards first build under concurrent access (threaded servers / async
+# endpoints racing on a cold process would otherwise double-build)
+_system_lock = threading.Lock()
+
 
 def create_multi_agent_system(use_memory: bool = True):
     """
@@ -110,8 +116,11 @@ def get_multi_agent_system(use_memory: bool = True):
     """
     global _multi_agent_system
 
+    # Double-checked locking: the fast path stays lock-free once built
     if _multi_agent_system is None:
-        _multi_agent_system = create_multi_agent_system(use_memory)
+        with _system_lock:
+            if _multi_agent_system is None:
+                _multi_agent_system = create_multi_agent_system(use_memory)
 
     return _multi_agent_system
 
@@ -138,6 +147,11 @@ def invoke_agent(
 
     Returns:
         Agent response string (or full state dict if return_full_state=True)
+
+    Note:
+        The graph nodes are async, so this sync convenience wrapper drives
+        them with asyncio.run(). From async code (e.g. FastAPI endpoints)
+        call agent.ainvoke()/astream() directly instead.
     """
     agent = get_multi_agent_system()
 
@@ -151,10 +165,10 @@ def invoke_agent(
     }
 
     # Invoke the agent
-    result = agent.invoke(
+    result = asyncio.run(agent.ainvoke(
         initial_state,
         config={"configurable": {"thread_id": thread_id}}
-    )
+    ))
 
     if return_full_state:
         return result
@@ -170,6 +184,53 @@ def invoke_agent(
     return "No response from agent"
 
 
+async def ainvoke_agent_stream(
+    message: str,
+    thread_id: str = "default",
+) -> AsyncIterator[str]:
+    """
+    Invoke the multi-agent system and stream response tokens as they arrive.
+
+    Unlike invoke_agent(), which blocks until the whole multi-agent trace
+    completes, this yields each LLM token delta as soon as it is generated.
+    Time-to-first-token drops from full-generation-time to first-token-time,
+    which is what web UIs need for live streaming.
+
+    Args:
+        message: User message
+        thread_id: Conversation thread ID for memory
+
+    Yields:
+        Response content deltas (token chunks) as strings
+
+    Example:
+        async for chunk in ainvoke_agent_stream("Extract text from invoice.pdf"):
+            print(chunk, end="", flush=True)
+    """
+    agent = get_multi_agent_system()
+
+    # Build initial state (same shape as invoke_agent)
+    initial_state = {
+        "messages": [HumanMessage(content=message)],
+        "next_agent": "",
+        "current_agent": "",
+        "task_type": "unknown",
+        "context": {},
+    }
+
+    # astream_events v2 surfaces per-token chunks from every chat model
+    # call inside the graph (supervisor routing + specialist responses)
+    async for event in agent.astream_events(
+        initial_state,
+        config={"configurable": {"thread_id": thread_id}},
+        version="v2",
+    ):
+        if event["event"] == "on_chat_model_stream":
+            chunk = event["data"]["chunk"]
+            if chunk.content:
+                yield chunk.content
+
+
 # For testing
 if __name__ == "__main__":
     import sys
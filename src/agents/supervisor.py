@@ -1,346 +1,669 @@
-"""
-Supervisor Agent - Multi-Agent Orchestration
-
-This implements the LangGraph Supervisor pattern for multi-agent systems.
-The supervisor analyzes incoming requests and routes them to specialist agents.
-
-Architecture:
-    User Request
-         ↓
-    ┌─────────────┐
-    │ Supervisor  │ ← GPT-4o-mini (cheap, fast routing)
-    └─────────────┘
-         ↓
-    ┌────┴────┐
-    ↓         ↓
-┌─────────┐ ┌─────────┐
-│Document │ │ Video   │  ← Specialist Agents
-│ Agent   │ │ Agent   │
-└─────────┘ └─────────┘
-         ↓
-    Response
-
-LangGraph Pattern Used (2025 Latest):
-    - Using langgraph-supervisor package for hierarchical multi-agent systems
-    - create_supervisor() for high-level orchestration
-    - Fallback to manual StateGraph for fine-grained control
-    - Supervisor node makes routing decisions via tool calling (handoff pattern)
-    - Specialist agents process tasks
-    - Results flow back through supervisor
-
-Model Selection (Cost Optimized):
-    - Supervisor: GPT-4o-mini ($0.15/1M) - cheap, fast routing
-    - Configurable via config/settings.py
-"""
-
-import os
-from typing import Literal, List, Callable
-from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_mistralai import ChatMistralAI
-from langchain_openai import ChatOpenAI
-from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
-
-from .base import AgentState, AGENT_NAMES, AGENT_DESCRIPTIONS
-from config.settings import settings
-
-# Try to import langgraph-supervisor (latest 2025 pattern)
-try:
-    from langgraph_supervisor import create_supervisor
-    HAS_SUPERVISOR_PACKAGE = True
-except ImportError:
-    HAS_SUPERVISOR_PACKAGE = False
-
-
-def get_supervisor_llm():
-    """
-    Get the LLM for the supervisor agent.
-
-    Uses GPT-4o-mini by default for cost efficiency (~$0.15/1M tokens).
-    Model is configurable via config/settings.py:
-      - supervisor_model: "gpt-4o-mini" (default)
-      - supervisor_provider: "openai" (default)
-      - supervisor_temperature: 0.1
-    """
-    provider = settings.supervisor_provider
-    model = settings.supervisor_model
-    temperature = settings.supervisor_temperature
-
-    # Primary: Use configured provider
-    if provider == "openai":
-        api_key = os.getenv("OPENAI_API_KEY")
-        if api_key:
-            print(f"[Supervisor] Using {model} (OpenAI) - cost optimized")
-            return ChatOpenAI(
-                model=model,
-                temperature=temperature,
-                api_key=api_key,
-            )
-
-    elif provider == "mistral":
-        api_key = os.getenv("MISTRAL_API_KEY")
-        if api_key and api_key != "your_mistral_api_key_here":
-            print(f"[Supervisor] Using {model} (Mistral)")
-            return ChatMistralAI(
-                model=model,
-                temperature=temperature,
-                api_key=api_key,
-            )
-
-    # Fallback: Try OpenAI if configured provider not available
-    api_key = os.getenv("OPENAI_API_KEY")
-    if api_key:
-        print("[Supervisor] Fallback to gpt-4o-mini (OpenAI)")
-        return ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0.1,
-            api_key=api_key,
-        )
-
-    # Fallback: Try Mistral
-    api_key = os.getenv("MISTRAL_API_KEY")
-    if api_key and api_key != "your_mistral_api_key_here":
-        print("[Supervisor] Fallback to mistral-large-latest")
-        return ChatMistralAI(
-            model="mistral-large-latest",
-            temperature=0.1,
-            api_key=api_key,
-        )
-
-    raise ValueError("No LLM API key configured (OPENAI_API_KEY or MISTRAL_API_KEY)")
-
-
-SUPERVISOR_SYSTEM_PROMPT = """You are a Supervisor Agent that routes user requests to specialist agents.
-
-Your role is to:
-1. Analyze the user's request
-2. Determine which specialist agent should handle it
-3. Route to the appropriate agent
-
-Available Specialist Agents:
-
-{agent_descriptions}
-
-Routing Rules:
-- For document processing, OCR, PDF, text extraction → route to "document_agent"
-- For video analysis, face detection, emotion analysis → route to "video_agent"
-- If the task is complete or needs no specialist → respond with "FINISH"
-
-IMPORTANT: You must respond with ONLY the agent name to route to:
-- "document_agent" - for document/OCR tasks
-- "video_agent" - for video/face/emotion tasks
-- "FINISH" - if you can answer directly or task is complete
-
-Do not explain your routing decision. Just output the agent name.
-"""
-
-
-def create_supervisor_node(llm):
-    """
-    Create the supervisor node function.
-
-    The supervisor analyzes messages and decides which agent to route to.
-    """
-    def supervisor_node(state: AgentState) -> AgentState:
-        """Supervisor decides which agent should handle the request."""
-
-        # Build the system prompt with agent descriptions
-        agent_desc_text = "\n\n".join([
-            f"**{name}**:\n{desc}"
-            for name, desc in AGENT_DESCRIPTIONS.items()
-        ])
-
-        system_prompt = SUPERVISOR_SYSTEM_PROMPT.format(
-            agent_descriptions=agent_desc_text
-        )
-
-        # Get the last user message
-        messages = state.get("messages", [])
-        if not messages:
-            return {
-                **state,
-                "next_agent": "FINISH",
-                "current_agent": "supervisor"
-            }
-
-        # Ask LLM to route
-        routing_messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=f"Route this request: {messages[-1].content}")
-        ]
-
-        response = llm.invoke(routing_messages)
-        routing_decision = response.content.strip().lower()
-
-        # Parse the routing decision
-        if "document" in routing_decision:
-            next_agent = "document_agent"
-            task_type = "document"
-        elif "video" in routing_decision:
-            next_agent = "video_agent"
-            task_type = "video"
-        elif "finish" in routing_decision:
-            next_agent = "FINISH"
-            task_type = "general"
-        else:
-            # Default to document agent for unclear requests
-            next_agent = "document_agent"
-            task_type = "unknown"
-
-        return {
-            **state,
-            "next_agent": next_agent,
-            "current_agent": "supervisor",
-            "task_type": task_type,
-        }
-
-    return supervisor_node
-
-
-def route_to_agent(state: AgentState) -> str:
-    """
-    Conditional routing function for the graph.
-
-    Returns the name of the next node to execute.
-    """
-    next_agent = state.get("next_agent", "FINISH")
-
-    if next_agent == "FINISH":
-        return END
-    elif next_agent == "document_agent":
-        return "document_agent"
-    elif next_agent == "video_agent":
-        return "video_agent"
-    else:
-        return END
-
-
-def build_supervisor_with_package(
-    agents: List,
-    use_memory: bool = True,
-):
-    """
-    Build supervisor using langgraph-supervisor package (2025 recommended approach).
-
-    This uses the high-level create_supervisor() API which:
-    - Automatically handles handoff between agents via tool calling
-    - Manages agent state and message flow
-    - Provides cleaner abstraction for multi-agent systems
-
-    Args:
-        agents: List of agent graphs/runnables to coordinate
-        use_memory: Whether to enable conversation memory
-
-    Returns:
-        Compiled supervisor workflow
-    """
-    if not HAS_SUPERVISOR_PACKAGE:
-        raise ImportError(
-            "langgraph-supervisor package not installed. "
-            "Install with: pip install langgraph-supervisor"
-        )
-
-    llm = get_supervisor_llm()
-    checkpointer = MemorySaver() if use_memory else None
-
-    # Build agent descriptions for supervisor prompt
-    agent_desc = "\n".join([
-        f"- {name}: {desc.strip()}"
-        for name, desc in AGENT_DESCRIPTIONS.items()
-    ])
-
-    supervisor_prompt = f"""You are a supervisor coordinating specialist agents.
-
-Available Agents:
-{agent_desc}
-
-Route requests to the appropriate agent based on the task type.
-- Document/OCR/PDF tasks → document_agent
-- Video/face/emotion tasks → video_agent
-"""
-
-    # Create supervisor using the package
-    workflow = create_supervisor(
-        agents=agents,
-        model=llm,
-        prompt=supervisor_prompt,
-    )
-
-    return workflow.compile(checkpointer=checkpointer)
-
-
-def build_supervisor_graph(
-    document_agent_node,
-    video_agent_node=None,
-    use_memory: bool = True,
-):
-    """
-    Build the multi-agent supervisor graph.
-
-    This creates a LangGraph StateGraph with:
-    - Supervisor node for routing decisions
-    - Document agent node for document processing
-    - Video agent node for video analysis (optional)
-
-    NOTE: This is the manual approach. For simpler setups, consider using
-    build_supervisor_with_package() with the langgraph-supervisor package.
-
-    Args:
-        document_agent_node: Function that processes document tasks
-        video_agent_node: Function that processes video tasks (optional)
-        use_memory: Whether to enable conversation memory
-
-    Returns:
-        Compiled LangGraph
-    """
-    # Get the supervisor LLM
-    llm = get_supervisor_llm()
-
-    # Create the supervisor node
-    supervisor = create_supervisor_node(llm)
-
-    # Build the graph
-    workflow = StateGraph(AgentState)
-
-    # Add nodes
-    workflow.add_node("supervisor", supervisor)
-    workflow.add_node("document_agent", document_agent_node)
-
-    if video_agent_node:
-        workflow.add_node("video_agent", video_agent_node)
-
-    # Set entry point
-    workflow.set_entry_point("supervisor")
-
-    # Add conditional routing from supervisor
-    if video_agent_node:
-        workflow.add_conditional_edges(
-            "supervisor",
-            route_to_agent,
-            {
-                "document_agent": "document_agent",
-                "video_agent": "video_agent",
-                END: END,
-            }
-        )
-    else:
-        workflow.add_conditional_edges(
-            "supervisor",
-            route_to_agent,
-            {
-                "document_agent": "document_agent",
-                END: END,
-            }
-        )
-
-    # After specialist agents, route back to supervisor or end
-    workflow.add_edge("document_agent", END)
-
-    if video_agent_node:
-        workflow.add_edge("video_agent", END)
-
-    # Set up memory
-    checkpointer = MemorySaver() if use_memory else None
-
-    # Compile the graph
-    return workflow.compile(checkpointer=checkpointer)
+"""
+Supervisor Agent - Multi-Agent Orchestration
+
+This implements the LangGraph Supervisor pattern for multi-agent systems.
+The supervisor analyzes incoming requests and routes them to specialist agents.
+
+Architecture:
+    User Request
+         ↓
+    ┌─────────────┐
+    │ Supervisor  │ ← GPT-4o-mini (cheap, fast routing)
+    └─────────────┘
+         ↓
+    ┌────┴────┐
+    ↓         ↓
+┌─────────┐ ┌─────────┐
+│Document │ │ Video   │  ← Specialist Agents
+│ Agent   │ │ Agent   │
+└─────────┘ └─────────┘
+         ↓
+    Response
+
+LangGraph Pattern Used (2025 Latest):
+    - Using langgraph-supervisor package for hierarchical multi-agent systems
+    - create_supervisor() for high-level orchestration
+    - Fallback to manual StateGraph for fine-grained control
+    - Supervisor node makes routing decisions via tool calling (handoff pattern)
+    - Specialist agents process tasks
+    - Results flow back through supervisor
+
+Model Selection (Cost Optimized):
+    - Supervisor: GPT-4o-mini ($0.15/1M) - cheap, fast routing
+    - Configurable via config/settings.py
+"""
+
+import os
+import re
+import sqlite3
+import time
+from functools import lru_cache
+from typing import Literal, List, Callable
+from langchain_core.messages import HumanMessage, SystemMessage
+from langgraph.graph import StateGraph, END
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.types import Send
+
+from .base import AgentState, AGENT_NAMES, AGENT_DESCRIPTIONS
+from ._llm_registry import get_llm
+from config.settings import settings
+
+# langgraph-supervisor (latest 2025 pattern) is only needed by the
+# build_supervisor_with_package path, so its import is deferred there -
+# the default manual-graph path shouldn't pay for an extra framework
+# stack at module import time.
+
+
+class DeferredMemorySaver(MemorySaver):
+    """
+    MemorySaver variant that batches checkpoint writes per thread.
+
+    LangGraph calls .put()/.put_writes() after every super-step, so a
+    single request produces one write per node plus task writes. This
+    saver buffers them in memory and only replays them into the real
+    store when the thread is next read (graph resume) or when flush()
+    is called - one batched write-back per workflow instead of one
+    write per node.
+
+    For the in-memory base this trims dict churn; the real win appears
+    if a persistent saver (e.g. SqliteSaver) adopts the same pattern,
+    where per-node writes dominate request latency.
+    """
+
+    def __init__(self):
+        super().__init__()
+        # thread_id -> ordered list of buffered ("put" | "put_writes") calls
+        self._pending: dict = {}
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        thread_id = config["configurable"]["thread_id"]
+        self._pending.setdefault(thread_id, []).append(
+            ("put", config, checkpoint, metadata, new_versions)
+        )
+        # Same config a real put would return, without touching the store
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": config["configurable"].get("checkpoint_ns", ""),
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        thread_id = config["configurable"]["thread_id"]
+        self._pending.setdefault(thread_id, []).append(
+            ("put_writes", config, writes, task_id, task_path)
+        )
+
+    def flush(self, thread_id=None) -> None:
+        """Replay buffered writes into the underlying store, in order."""
+        thread_ids = (
+            list(self._pending) if thread_id is None
+            else [thread_id] if thread_id in self._pending
+            else []
+        )
+        for tid in thread_ids:
+            for entry in self._pending.pop(tid, []):
+                if entry[0] == "put":
+                    super().put(*entry[1:])
+                else:
+                    super().put_writes(*entry[1:])
+
+    def get_tuple(self, config):
+        # Make this thread's buffered checkpoints visible before any read
+        # (this is what makes conversation resume work)
+        self.flush(config["configurable"].get("thread_id"))
+        return super().get_tuple(config)
+
+
+def _make_checkpointer(use_memory: bool, checkpoint_mode: str):
+    """Build the checkpointer for a graph (or None when memory is off)."""
+    if not use_memory:
+        return None
+    if checkpoint_mode == "end_of_workflow":
+        return DeferredMemorySaver()
+    return MemorySaver()
+
+
+@lru_cache(maxsize=1)
+def get_supervisor_llm():
+    """
+    Get the LLM for the supervisor agent.
+
+    Uses GPT-4o-mini by default for cost efficiency (~$0.15/1M tokens).
+    Model is configurable via config/settings.py:
+      - supervisor_model: "gpt-4o-mini" (default)
+      - supervisor_provider: "openai" (default)
+      - supervisor_temperature: 0.1
+
+    Memoized: both graph builders call this, and each call used to
+    construct a fresh client. The underlying instance is also shared
+    through the LLM registry, so agents with the same config reuse it.
+    """
+    provider = settings.supervisor_provider
+    model = settings.supervisor_model
+    temperature = settings.supervisor_temperature
+
+    # Primary: Use configured provider
+    if provider == "openai":
+        api_key = os.getenv("OPENAI_API_KEY")
+        if api_key:
+            print(f"[Supervisor] Using {model} (OpenAI) - cost optimized")
+            return get_llm(
+                "openai",
+                model,
+                temperature=temperature,
+                api_key=api_key,
+            )
+
+    elif provider == "mistral":
+        api_key = os.getenv("MISTRAL_API_KEY")
+        if api_key and api_key != "your_mistral_api_key_here":
+            print(f"[Supervisor] Using {model} (Mistral)")
+            return get_llm(
+                "mistral",
+                model,
+                temperature=temperature,
+                api_key=api_key,
+            )
+
+    # Fallback: Try OpenAI if configured provider not available
+    api_key = os.getenv("OPENAI_API_KEY")
+    if api_key:
+        print("[Supervisor] Fallback to gpt-4o-mini (OpenAI)")
+        return get_llm(
+            "openai",
+            "gpt-4o-mini",
+            temperature=0.1,
+            api_key=api_key,
+        )
+
+    # Fallback: Try Mistral
+    api_key = os.getenv("MISTRAL_API_KEY")
+    if api_key and api_key != "your_mistral_api_key_here":
+        print("[Supervisor] Fallback to mistral-large-latest")
+        return get_llm(
+            "mistral",
+            "mistral-large-latest",
+            temperature=0.1,
+            api_key=api_key,
+        )
+
+    raise ValueError("No LLM API key configured (OPENAI_API_KEY or MISTRAL_API_KEY)")
+
+
+SUPERVISOR_SYSTEM_PROMPT = """You are a Supervisor Agent that routes user requests to specialist agents.
+
+Your role is to:
+1. Analyze the user's request
+2. Determine which specialist agent should handle it
+3. Route to the appropriate agent
+
+Available Specialist Agents:
+
+{agent_descriptions}
+
+Routing Rules:
+- For document processing, OCR, PDF, text extraction → route to "document_agent"
+- For video analysis, face detection, emotion analysis → route to "video_agent"
+- If the task is complete or needs no specialist → respond with "FINISH"
+
+IMPORTANT: You must respond with ONLY the agent name to route to:
+- "document_agent" - for document/OCR tasks
+- "video_agent" - for video/face/emotion tasks
+- "FINISH" - if you can answer directly or task is complete
+
+Do not explain your routing decision. Just output the agent name.
+"""
+
+# AGENT_DESCRIPTIONS is static, so build the formatted prompts once at
+# import time instead of re-joining and re-formatting on every request.
+#
+# The items are sorted so the rendered prompt is byte-identical across
+# Python runs: provider-side prompt caching (OpenAI/Anthropic) keys on a
+# stable prefix, and any byte difference in the system prompt kills the
+# cache hit. All variable content stays in the trailing HumanMessage.
+_AGENT_DESC_TEXT = "\n\n".join(
+    f"**{name}**:\n{desc}"
+    for name, desc in sorted(AGENT_DESCRIPTIONS.items())
+)
+
+_SUPERVISOR_SYSTEM = SUPERVISOR_SYSTEM_PROMPT.format(
+    agent_descriptions=_AGENT_DESC_TEXT
+)
+
+# Compact variant used by build_supervisor_with_package
+_PACKAGE_AGENT_DESC = "\n".join(
+    f"- {name}: {desc.strip()}"
+    for name, desc in sorted(AGENT_DESCRIPTIONS.items())
+)
+
+_PACKAGE_SUPERVISOR_PROMPT = f"""You are a supervisor coordinating specialist agents.
+
+Available Agents:
+{_PACKAGE_AGENT_DESC}
+
+Route requests to the appropriate agent based on the task type.
+- Document/OCR/PDF tasks → document_agent
+- Video/face/emotion tasks → video_agent
+
+When a request needs INDEPENDENT work from several agents (e.g. analyze
+an image AND extract text from a document), emit all of those handoff
+tool calls in a SINGLE response instead of one per turn - they will be
+executed concurrently. Only chain sequentially when one agent's output
+is required as another agent's input.
+"""
+
+
+# === ROUTING DECISION CACHE ===
+#
+# Routing is a tiny classification (document_agent / video_agent / FINISH),
+# but each decision costs a full LLM roundtrip (hundreds of ms and tokens).
+# Repeated queries are common ("extract text from invoice.pdf" retried,
+# health-check style probes), so cache decisions by normalized query text.
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# === RULES-FIRST ROUTING ===
+#
+# Most queries contain an unambiguous task keyword, and the LLM's own
+# routing rules boil down to the same keyword match. Precompiled patterns
+# route those queries in microseconds; the LLM only sees the ambiguous
+# remainder (both kinds of keywords, or neither).
+
+_DOC_RE = re.compile(
+    r"\b(document|ocr|pdf|text|receipt|invoice|form|contract|scan)\b", re.I
+)
+# Video keywords only - still-image words (image/picture/photo) are
+# deliberately absent: "extract text from this image" is the canonical
+# OCR phrasing, and matching them here turned pure document tasks into
+# needless doc+video fan-outs. Pure still-image questions with no doc
+# keyword fall through to the LLM, which routes them fine.
+_VIDEO_RE = re.compile(
+    r"\b(video|frame|face|emotion|mp4|webcam|scene)\b", re.I
+)
+
+# Single-pass parser for the LLM's routing reply: one regex scan plus a
+# dict dispatch instead of three substring scans and an if/elif ladder
+# Trivial messages that never need a specialist (or an LLM to say so)
+_TRIVIAL_MESSAGES = frozenset({
+    "hi", "hello", "hey", "yo", "thanks", "thank you", "bye", "ok", "okay",
+})
+
+_DECISION_RE = re.compile(r"document|video|finish")
+_DECISION_MAP = {
+    "document": ("document_agent", "document"),
+    "video": ("video_agent", "video"),
+    "finish": ("FINISH", "general"),
+}
+
+# normalized query -> (next_agent, task_type, cached_at monotonic seconds)
+_routing_cache: dict = {}
+_ROUTING_CACHE_TTL_SECONDS = 1800.0  # 30 minutes
+
+# Persistent second level: the in-memory cache dies with the process, so
+# LLM routing decisions are also written to a small SQLite table under
+# checkpoint_dir. Known queries then skip the LLM even after restarts
+# and deploys. Longer TTL than memory - decisions age out after a day.
+_PERSISTENT_ROUTING_TTL_SECONDS = 86400.0
+_routing_db_conn = None
+
+
+def _get_routing_db() -> sqlite3.Connection:
+    """Get or create the process-wide routing-cache connection (WAL mode)."""
+    global _routing_db_conn
+
+    if _routing_db_conn is None:
+        db_path = settings.checkpoint_dir / "routing_cache.db"
+        conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS routing_cache ("
+            "key TEXT PRIMARY KEY, next_agent TEXT, task_type TEXT, ts REAL)"
+        )
+        conn.commit()
+        _routing_db_conn = conn
+
+    return _routing_db_conn
+
+
+def _normalize_routing_key(text: str) -> str:
+    """Normalize a user query into a cache key (case/whitespace-insensitive)."""
+    return _WHITESPACE_RE.sub(" ", text.strip().lower())
+
+
+def _get_cached_routing(key: str):
+    """Return a cached (next_agent, task_type) if present and fresh, else None."""
+    cached = _routing_cache.get(key)
+    if cached is not None:
+        next_agent, task_type, cached_at = cached
+        if time.monotonic() - cached_at <= _ROUTING_CACHE_TTL_SECONDS:
+            return next_agent, task_type
+        # Stale entry - drop it so lower levels / the LLM re-decide
+        del _routing_cache[key]
+
+    # Second level: decisions persisted by earlier runs of this service
+    try:
+        row = _get_routing_db().execute(
+            "SELECT next_agent, task_type FROM routing_cache"
+            " WHERE key = ? AND ts > ?",
+            (key, time.time() - _PERSISTENT_ROUTING_TTL_SECONDS),
+        ).fetchone()
+    except sqlite3.Error:
+        return None
+
+    if row is None:
+        return None
+
+    # Hydrate the in-memory level so the next hit skips SQLite too
+    _routing_cache[key] = (row[0], row[1], time.monotonic())
+    return row[0], row[1]
+
+
+def _store_routing_decision(key: str, next_agent: str, task_type: str) -> None:
+    """Record an LLM routing decision in both cache levels."""
+    _routing_cache[key] = (next_agent, task_type, time.monotonic())
+    try:
+        db = _get_routing_db()
+        db.execute(
+            "INSERT OR REPLACE INTO routing_cache (key, next_agent, task_type, ts)"
+            " VALUES (?, ?, ?, ?)",
+            (key, next_agent, task_type, time.time()),
+        )
+        db.commit()
+    except sqlite3.Error:
+        # Persistence is best-effort; the in-memory level already has it
+        pass
+
+
+def clear_routing_cache() -> None:
+    """Clear cached routing decisions (useful for testing or prompt changes)."""
+    _routing_cache.clear()
+    try:
+        db = _get_routing_db()
+        db.execute("DELETE FROM routing_cache")
+        db.commit()
+    except sqlite3.Error:
+        pass
+
+
+def create_supervisor_node(llm):
+    """
+    Create the supervisor node function.
+
+    The supervisor analyzes messages and decides which agent to route to.
+    """
+    async def supervisor_node(state: AgentState) -> AgentState:
+        """Supervisor decides which agent should handle the request."""
+
+        # Get the last user message
+        messages = state.get("messages", [])
+        if not messages:
+            return {
+                "next_agent": "FINISH",
+                "current_agent": "supervisor"
+            }
+
+        # Trivial traffic (greetings, acknowledgements) finishes straight
+        # away - no specialist and no LLM call to decide that. Exact
+        # membership only: a length cutoff would swallow short domain
+        # keywords like "ocr" or "pdf"
+        normalized = _normalize_routing_key(str(messages[-1].content))
+        if normalized in _TRIVIAL_MESSAGES:
+            return {
+                "next_agent": "FINISH",
+                "current_agent": "supervisor",
+                "task_type": "general",
+            }
+
+        # Check the routing cache first - a repeated query skips the LLM
+        cache_key = normalized
+        cached = _get_cached_routing(cache_key)
+        if cached is not None:
+            next_agent, task_type = cached
+            return {
+                "next_agent": next_agent,
+                "current_agent": "supervisor",
+                "task_type": task_type,
+            }
+
+        # Rules-first fast path: if exactly one keyword family matches,
+        # route directly and skip the LLM call entirely
+        user_text = str(messages[-1].content)
+        doc_hit = _DOC_RE.search(user_text) is not None
+        video_hit = _VIDEO_RE.search(user_text) is not None
+        if doc_hit and video_hit:
+            # Multi-step query touching both specialists: fan out so they
+            # run in parallel instead of chaining sequentially
+            return {
+                "next_agent": "both",
+                "current_agent": "supervisor",
+                "task_type": "general",
+            }
+        if doc_hit != video_hit:
+            next_agent = "document_agent" if doc_hit else "video_agent"
+            task_type = "document" if doc_hit else "video"
+            return {
+                "next_agent": next_agent,
+                "current_agent": "supervisor",
+                "task_type": task_type,
+            }
+
+        # Ambiguous (both or neither matched) - ask the LLM to route
+        routing_messages = [
+            SystemMessage(content=_SUPERVISOR_SYSTEM),
+            HumanMessage(content=f"Route this request: {messages[-1].content}")
+        ]
+
+        # ainvoke keeps the ASGI event loop free while the provider responds
+        response = await llm.ainvoke(routing_messages)
+        routing_decision = response.content.strip().lower()
+
+        # Parse the routing decision in a single scan
+        # (default to document agent for unclear responses)
+        match = _DECISION_RE.search(routing_decision)
+        next_agent, task_type = (
+            _DECISION_MAP[match.group(0)]
+            if match
+            else ("document_agent", "unknown")
+        )
+
+        # Remember the decision for identical future queries (both levels)
+        _store_routing_decision(cache_key, next_agent, task_type)
+
+        return {
+            "next_agent": next_agent,
+            "current_agent": "supervisor",
+            "task_type": task_type,
+        }
+
+    return supervisor_node
+
+
+# Static routing table: decision -> next node. Built once at module
+# scope so route_to_agent is a single dict lookup per graph hop instead
+# of an if/elif chain (unknown decisions fall through to END).
+_ROUTES = {
+    "FINISH": END,
+    "document_agent": "document_agent",
+    "video_agent": "video_agent",
+}
+
+
+def route_to_agent(state: AgentState) -> str:
+    """
+    Conditional routing function for the graph.
+
+    Returns the name of the next node to execute.
+    """
+    next_agent = state.get("next_agent", "FINISH")
+
+    if next_agent == "both":
+        # Fan out: run both specialists in parallel (Send dispatches each
+        # with the current state; their results merge via state reducers)
+        return [
+            Send("document_agent", state),
+            Send("video_agent", state),
+        ]
+
+    return _ROUTES.get(next_agent, END)
+
+
+def route_to_agent_document_only(state: AgentState) -> str:
+    """
+    Routing for graphs compiled WITHOUT a video agent node.
+
+    The supervisor can still decide "video_agent" or "both" (its rules
+    don't know which nodes the graph has), but a Send to a missing node
+    crashes the graph - so anything video-flavored degrades to the
+    document agent, the only specialist available.
+    """
+    target = route_to_agent(state)
+    if isinstance(target, list) or target == "video_agent":
+        return "document_agent"
+    return target
+
+
+def build_supervisor_with_package(
+    agents: List,
+    use_memory: bool = True,
+    checkpoint_mode: str = "per_node",
+):
+    """
+    Build supervisor using langgraph-supervisor package (2025 recommended approach).
+
+    This uses the high-level create_supervisor() API which:
+    - Automatically handles handoff between agents via tool calling
+    - Manages agent state and message flow
+    - Provides cleaner abstraction for multi-agent systems
+
+    Args:
+        agents: List of agent graphs/runnables to coordinate
+        use_memory: Whether to enable conversation memory
+        checkpoint_mode: "per_node" (write after every node) or
+                         "end_of_workflow" (batch writes per workflow)
+
+    Returns:
+        Compiled supervisor workflow
+    """
+    try:
+        from langgraph_supervisor import create_supervisor
+    except ImportError:
+        raise ImportError(
+            "langgraph-supervisor package not installed. "
+            "Install with: pip install langgraph-supervisor"
+        )
+
+    llm = get_supervisor_llm()
+    checkpointer = _make_checkpointer(use_memory, checkpoint_mode)
+
+    # Create supervisor using the package (prompt is built at import time)
+    workflow = create_supervisor(
+        agents=agents,
+        model=llm,
+        prompt=_PACKAGE_SUPERVISOR_PROMPT,
+    )
+
+    return workflow.compile(checkpointer=checkpointer)
+
+
+# Compiled graphs cached by node identity + memory settings. The node
+# functions are per-process singletons, so rebuilding the StateGraph and
+# re-compiling for the same inputs is pure duplicate work (and would
+# discard the cached graph's conversation memory).
+_compiled_graph_cache: dict = {}
+
+
+def build_supervisor_graph(
+    document_agent_node,
+    video_agent_node=None,
+    use_memory: bool = True,
+    checkpoint_mode: str = "per_node",
+):
+    """
+    Build the multi-agent supervisor graph.
+
+    This creates a LangGraph StateGraph with:
+    - Supervisor node for routing decisions
+    - Document agent node for document processing
+    - Video agent node for video analysis (optional)
+
+    NOTE: This is the manual approach. For simpler setups, consider using
+    build_supervisor_with_package() with the langgraph-supervisor package.
+
+    Args:
+        document_agent_node: Function that processes document tasks
+        video_agent_node: Function that processes video tasks (optional)
+        use_memory: Whether to enable conversation memory
+        checkpoint_mode: "per_node" (write after every node) or
+                         "end_of_workflow" (batch writes per workflow)
+
+    Returns:
+        Compiled LangGraph
+    """
+    # Reuse an already-compiled graph for identical build inputs
+    cache_key = (
+        id(document_agent_node),
+        id(video_agent_node),
+        use_memory,
+        checkpoint_mode,
+    )
+    cached_graph = _compiled_graph_cache.get(cache_key)
+    if cached_graph is not None:
+        return cached_graph
+
+    # Get the supervisor LLM
+    llm = get_supervisor_llm()
+
+    # Create the supervisor node
+    supervisor = create_supervisor_node(llm)
+
+    # Build the graph
+    workflow = StateGraph(AgentState)
+
+    # Add nodes
+    workflow.add_node("supervisor", supervisor)
+    workflow.add_node("document_agent", document_agent_node)
+
+    if video_agent_node:
+        workflow.add_node("video_agent", video_agent_node)
+
+    # Set entry point
+    workflow.set_entry_point("supervisor")
+
+    # Add conditional routing from supervisor
+    if video_agent_node:
+        workflow.add_conditional_edges(
+            "supervisor",
+            route_to_agent,
+            {
+                "document_agent": "document_agent",
+                "video_agent": "video_agent",
+                END: END,
+            }
+        )
+    else:
+        # No video node exists: use the degraded router so "video_agent"
+        # and "both" decisions can't target a missing node
+        workflow.add_conditional_edges(
+            "supervisor",
+            route_to_agent_document_only,
+            {
+                "document_agent": "document_agent",
+                END: END,
+            }
+        )
+
+    # After specialist agents, route back to supervisor or end
+    workflow.add_edge("document_agent", END)
+
+    if video_agent_node:
+        workflow.add_edge("video_agent", END)
+
+    # Set up memory
+    checkpointer = _make_checkpointer(use_memory, checkpoint_mode)
+
+    # Compile the graph and remember it for identical future builds
+    compiled = workflow.compile(checkpointer=checkpointer)
+    _compiled_graph_cache[cache_key] = compiled
+    return compiled
@@ -33,26 +33,62 @@ wrapped to work within the multi-agent supervisor system.
 """
 
 import os
+import threading
+from functools import lru_cache
 from typing import Optional
 
 from langchain_core.messages import AIMessage, HumanMessage
-from langchain_openai import ChatOpenAI
 from langchain.agents import create_agent
 
 from .base import AgentState
+from ._llm_registry import get_llm
 from src.tools.video_tools import VIDEO_TOOLS
 from config.settings import settings
 from src.clients.groq_client import is_groq_available
 
-# Try to import Groq LangChain integration
+# Try to import Groq LangChain integration (the registry imports it
+# lazily for construction; this flag just gates the Groq code paths)
 try:
-    from langchain_groq import ChatGroq
+    import langchain_groq  # noqa: F401
     HAS_LANGCHAIN_GROQ = True
 except ImportError:
-    ChatGroq = None
     HAS_LANGCHAIN_GROQ = False
 
 
+# Flag so the process-wide LLM cache is only configured once
+_llm_cache_configured = False
+
+
+def _configure_llm_cache():
+    """
+    Enable LangChain's exact-match response cache (SQLite-backed).
+
+    Repeated prompts ("detect faces", "count people") against the same
+    model short-circuit before any network call - the cached response
+    comes back in microseconds and costs zero tokens. The cache is
+    global to the process (set_llm_cache), so the supervisor and
+    document agent benefit from it too; it persists across restarts
+    under the checkpoints directory.
+    """
+    global _llm_cache_configured
+    if _llm_cache_configured:
+        return
+
+    # Mark configured even if the import fails so we don't retry per call
+    _llm_cache_configured = True
+
+    try:
+        from langchain_community.cache import SQLiteCache
+        from langchain_core.globals import set_llm_cache
+    except ImportError:
+        print("[VideoAgent] langchain-community not installed - LLM cache disabled")
+        return
+
+    cache_path = settings.checkpoint_dir / "llm_cache.db"
+    set_llm_cache(SQLiteCache(database_path=str(cache_path)))
+    print(f"[VideoAgent] LLM response cache enabled: {cache_path}")
+
+
 VIDEO_AGENT_PROMPT = """You are a Video Analysis Specialist optimized for real-time robotics vision.
 
 You are powered by Groq's Llama 3.2 Vision model with ~50ms latency,
@@ -69,12 +105,15 @@ Available Tools:
 - `describe_scene`: Get robotics-optimized scene descriptions with spatial info
 - `detect_objects`: List all objects with locations and characteristics
 - `visual_question`: Answer specific yes/no or factual questions about images
+- `analyze_frame_batch`: Analyze MULTIPLE frames in one call (tiled grid)
 
 Guidelines:
 - For general understanding → use `analyze_image`
 - For spatial/navigation info → use `describe_scene`
 - For object identification → use `detect_objects`
 - For specific questions → use `visual_question`
+- For several frames/images at once → use `analyze_frame_batch` (one
+  call for all frames instead of one call per frame)
 
 When you receive an image path, use the appropriate tool to analyze it.
 Provide clear, actionable insights for robotic systems.
@@ -95,11 +134,31 @@ def get_video_llm():
       - video_agent_temperature: 0.3
 
     Fallback to GPT-4o for higher accuracy when Groq unavailable.
+
+    The resolved LLM is memoized per (provider, model, temperature), so
+    repeated calls on the agent hot path skip env lookups, provider
+    fallback checks, and Pydantic model construction entirely.
     """
-    provider = settings.video_agent_provider
-    model = settings.video_agent_model
-    temperature = settings.video_agent_temperature
+    # Cache repeated prompts before the first model is even built
+    _configure_llm_cache()
 
+    return _build_video_llm(
+        settings.video_agent_provider,
+        settings.video_agent_model,
+        settings.video_agent_temperature,
+    )
+
+
+@lru_cache(maxsize=4)
+def _build_video_llm(provider: str, model: str, temperature: float):
+    """
+    Resolve and build the video LLM for one configuration.
+
+    API keys are resolved INSIDE the cached builder so the returned
+    object (and its underlying HTTP session) is reused across calls -
+    keep-alive connections survive between Groq requests instead of
+    being rebuilt per node invocation.
+    """
     # Primary: Groq for low-latency robotics vision
     # Note: Llama 4 models now support native vision (multimodal)
     if provider == "groq" and HAS_LANGCHAIN_GROQ:
@@ -108,8 +167,9 @@ def get_video_llm():
             # Use Llama 4 Scout for fast multimodal (vision) tasks
             groq_model = "meta-llama/llama-4-scout-17b-16e-instruct"
             print(f"[VideoAgent] Using {groq_model} (Groq) - fast multimodal")
-            return ChatGroq(
-                model=groq_model,
+            return get_llm(
+                "groq",
+                groq_model,
                 temperature=temperature,
                 api_key=api_key,
             )
@@ -118,8 +178,9 @@ def get_video_llm():
         api_key = os.getenv("OPENAI_API_KEY")
         if api_key:
             print(f"[VideoAgent] Using {model} (OpenAI)")
-            return ChatOpenAI(
-                model=model,
+            return get_llm(
+                "openai",
+                model,
                 temperature=temperature,
                 api_key=api_key,
             )
@@ -128,8 +189,9 @@ def get_video_llm():
     if HAS_LANGCHAIN_GROQ and is_groq_available():
         api_key = os.getenv("GROQ_API_KEY")
         print("[VideoAgent] Fallback to Llama 4 Scout (Groq)")
-        return ChatGroq(
-            model="meta-llama/llama-4-scout-17b-16e-instruct",
+        return get_llm(
+            "groq",
+            "meta-llama/llama-4-scout-17b-16e-instruct",
             temperature=0.3,
             api_key=api_key,
         )
@@ -138,8 +200,9 @@ def get_video_llm():
     api_key = os.getenv("OPENAI_API_KEY")
     if api_key:
         print("[VideoAgent] Fallback to gpt-4o (OpenAI) - higher latency")
-        return ChatOpenAI(
-            model="gpt-4o",
+        return get_llm(
+            "openai",
+            "gpt-4o",
             temperature=0.3,
             api_key=api_key,
         )
@@ -147,8 +210,17 @@ def get_video_llm():
     raise ValueError("No vision LLM available (GROQ_API_KEY or OPENAI_API_KEY)")
 
 
+# Constant reply contents, built once at import instead of per call
+_NO_INPUT_CONTENT = (
+    "I'm the Video Analysis Agent optimized for robotics (~50ms latency). "
+    "Please provide an image path to analyze or ask about my capabilities."
+)
+_FALLBACK_CONTENT = "Image analysis completed."
+
+
 # Singleton for the internal video agent
 _video_agent = None
+_video_agent_lock = threading.Lock()
 
 
 def get_video_agent():
@@ -162,13 +234,16 @@ def get_video_agent():
     """
     global _video_agent
 
+    # Double-checked locking: the fast path stays lock-free once built
     if _video_agent is None:
-        llm = get_video_llm()
-        _video_agent = create_agent(
-            model=llm,
-            tools=VIDEO_TOOLS,
-            system_prompt=VIDEO_AGENT_PROMPT,
-        )
+        with _video_agent_lock:
+            if _video_agent is None:
+                llm = get_video_llm()
+                _video_agent = create_agent(
+                    model=llm,
+                    tools=VIDEO_TOOLS,
+                    system_prompt=VIDEO_AGENT_PROMPT,
+                )
 
     return _video_agent
 
@@ -179,11 +254,14 @@ def reset_video_agent():
     _video_agent = None
 
 
-def video_agent_node(state: AgentState) -> AgentState:
+async def video_agent_node(state: AgentState) -> AgentState:
     """
     Video Agent node for the multi-agent graph.
 
     This wraps the agent to work within the supervisor system.
+    Async so the ~50ms Groq round-trip awaits on the event loop instead
+    of blocking a worker thread - when the supervisor fans out to both
+    specialists, their network waits overlap instead of serializing.
 
     Args:
         state: Current AgentState from the supervisor
@@ -198,19 +276,17 @@ def video_agent_node(state: AgentState) -> AgentState:
     messages = state.get("messages", [])
 
     if not messages:
-        # No messages to process
-        response_message = AIMessage(
-            content="I'm the Video Analysis Agent optimized for robotics (~50ms latency). Please provide an image path to analyze or ask about my capabilities."
-        )
+        # No messages to process (a fresh AIMessage per call is required:
+        # reusing one instance would pin its message id across threads).
+        # Return only the delta - LangGraph merges it into the state
         return {
-            **state,
-            "messages": [response_message],
+            "messages": [AIMessage(content=_NO_INPUT_CONTENT)],
             "current_agent": "video_agent",
         }
 
     # Invoke the agent with the messages
     try:
-        result = agent.invoke({
+        result = await agent.ainvoke({
             "messages": messages
         })
 
@@ -218,20 +294,34 @@ def video_agent_node(state: AgentState) -> AgentState:
         response_messages = result.get("messages", [])
 
         # Get the last AI message as the response
-        ai_messages = [m for m in response_messages if isinstance(m, AIMessage)]
-        if ai_messages:
-            final_response = ai_messages[-1]
-        else:
-            final_response = AIMessage(content="Image analysis completed.")
+        # Scan from the end so we stop at the first hit instead of
+        # building an intermediate list of every AI message in the trace
+        final_response = next(
+            (m for m in reversed(response_messages) if isinstance(m, AIMessage)),
+            AIMessage(content=_FALLBACK_CONTENT)
+        )
 
+        # Surface Groq's prefix-cache metric. The static system prompt
+        # always leads the conversation byte-identically (create_agent
+        # prepends the same module-level string, and history is appended
+        # rather than rewritten), so cached_tokens should approach the
+        # full static prefix on multi-turn threads - a visible drop
+        # means something is mutating the prefix and breaking caching.
+        cached_tokens = (
+            final_response.response_metadata
+            .get("x_groq", {})
+            .get("usage", {})
+            .get("cached_tokens", 0)
+        ) if final_response.response_metadata else 0
+        if cached_tokens:
+            print(f"[VideoAgent] Groq prefix cache hit: {cached_tokens} tokens")
+
+        # Return only the delta - the messages and context reducers in
+        # AgentState merge it, so no full state copy happens per node
         return {
-            **state,
             "messages": [final_response],
             "current_agent": "video_agent",
-            "context": {
-                **state.get("context", {}),
-                "video_result": final_response.content
-            }
+            "context": {"video_result": final_response.content},
         }
 
     except Exception as e:
@@ -239,7 +329,6 @@ def video_agent_node(state: AgentState) -> AgentState:
             content=f"Video analysis error: {str(e)}. Please ensure the image path is correct and the file exists."
         )
         return {
-            **state,
             "messages": [error_message],
             "current_agent": "video_agent",
         }
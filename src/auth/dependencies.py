@@ -1,310 +1,526 @@
-"""
-Authentication Dependencies for FastAPI
-
-FastAPI dependencies are reusable components that:
-1. Run before your endpoint code
-2. Can validate/extract data
-3. Can return values to your endpoint
-4. Handle common tasks like authentication
-
-=== HOW DEPENDENCIES WORK ===
-
-    @router.get("/protected")
-    async def protected_route(user: User = Depends(get_current_user)):
-        # 'user' is automatically populated by get_current_user
-        # If auth fails, HTTP 401 is raised automatically
-        return {"message": f"Hello {user.username}"}
-
-=== AUTHENTICATION FLOW ===
-
-1. Client sends request with header:
-   Authorization: Bearer eyJ0eXAiOiJKV1Q...
-
-2. oauth2_scheme extracts the token
-
-3. get_current_user:
-   - Decodes the token
-   - Looks up the user
-   - Returns User object or raises 401
-
-4. Your endpoint receives the authenticated user
-"""
-
-from typing import Optional
-from fastapi import Depends, HTTPException, status, Request
-from fastapi.security import OAuth2PasswordBearer, APIKeyHeader
-
-from config.settings import settings
-from .models import User, UserInDB, TokenData
-from .utils import decode_token, verify_password
-
-
-# === OAUTH2 SCHEME ===
-
-# This tells FastAPI where to get the token from
-# tokenUrl is where clients should POST to get a token
-oauth2_scheme = OAuth2PasswordBearer(
-    tokenUrl="/api/v1/auth/token",
-    auto_error=False  # Don't auto-raise, we'll handle it
-)
-
-# API Key header scheme
-api_key_header = APIKeyHeader(
-    name="X-API-Key",
-    auto_error=False  # Don't auto-raise, we'll handle it
-)
-
-
-# === FAKE USER DATABASE ===
-# In production, replace with real database queries
-
-def get_user_from_db(username: str) -> Optional[UserInDB]:
-    """
-    Get user from database.
-
-    Currently uses environment variables for the admin user.
-    In production, replace with real database queries.
-
-    Args:
-        username: Username to look up
-
-    Returns:
-        UserInDB if found, None otherwise
-    """
-    # Check if it's the admin user
-    if username == settings.ADMIN_USERNAME:
-        # Get password hash from settings (loaded from .env)
-        password_hash = settings.ADMIN_PASSWORD_HASH
-
-        if not password_hash:
-            # If no hash is set, create a default one for development
-            # WARNING: Change this in production!
-            from .utils import get_password_hash
-            password_hash = get_password_hash("admin123")
-
-        return UserInDB(
-            username=settings.ADMIN_USERNAME,
-            email="admin@example.com",
-            full_name="Administrator",
-            disabled=False,
-            is_admin=True,
-            password_hash=password_hash
-        )
-
-    return None
-
-
-def authenticate_user(username: str, password: str) -> Optional[UserInDB]:
-    """
-    Authenticate a user by username and password.
-
-    Args:
-        username: The username
-        password: Plain text password
-
-    Returns:
-        UserInDB if credentials valid, None otherwise
-    """
-    user = get_user_from_db(username)
-    if not user:
-        return None
-
-    if not verify_password(password, user.password_hash):
-        return None
-
-    return user
-
-
-# === DEPENDENCY FUNCTIONS ===
-
-async def get_current_user(
-    request: Request,
-    token: Optional[str] = Depends(oauth2_scheme)
-) -> User:
-    """
-    Get the current authenticated user from JWT token.
-
-    This is the main authentication dependency.
-    Use it to protect endpoints that require login.
-
-    Usage:
-        @router.get("/protected")
-        async def route(user: User = Depends(get_current_user)):
-            return {"user": user.username}
-
-    Raises:
-        HTTPException 401: If token is missing or invalid
-    """
-    # Check if path is public
-    if request.url.path in settings.PUBLIC_PATHS:
-        # Return a dummy user for public paths
-        return User(username="anonymous", disabled=False)
-
-    # Check if auth is disabled (development mode)
-    if not settings.AUTH_ENABLED:
-        return User(username="dev_user", disabled=False, is_admin=True)
-
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
-    if not token:
-        raise credentials_exception
-
-    # Decode the token
-    payload = decode_token(token)
-    if payload is None:
-        raise credentials_exception
-
-    username: str = payload.get("sub")
-    if username is None:
-        raise credentials_exception
-
-    # Get user from database
-    user = get_user_from_db(username)
-    if user is None:
-        raise credentials_exception
-
-    return User(
-        username=user.username,
-        email=user.email,
-        full_name=user.full_name,
-        disabled=user.disabled,
-        is_admin=user.is_admin
-    )
-
-
-async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
-    """
-    Get current user, but only if account is active.
-
-    Use this instead of get_current_user when you need
-    to ensure the user's account isn't disabled.
-
-    Raises:
-        HTTPException 403: If user account is disabled
-    """
-    if current_user.disabled:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="User account is disabled"
-        )
-    return current_user
-
-
-async def verify_api_key(
-    request: Request,
-    api_key: Optional[str] = Depends(api_key_header)
-) -> str:
-    """
-    Verify API key from X-API-Key header.
-
-    Use this for service-to-service authentication.
-
-    Usage:
-        @router.get("/service")
-        async def route(api_key: str = Depends(verify_api_key)):
-            return {"message": "Authorized"}
-
-    Raises:
-        HTTPException 401: If API key is missing or invalid
-    """
-    # Check if path is public
-    if request.url.path in settings.PUBLIC_PATHS:
-        return "public"
-
-    # Check if auth is disabled
-    if not settings.AUTH_ENABLED:
-        return "auth_disabled"
-
-    if not api_key:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="API key required",
-            headers={"WWW-Authenticate": "ApiKey"},
-        )
-
-    # Check against configured API key
-    if settings.API_KEY and api_key == settings.API_KEY:
-        return api_key
-
-    raise HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Invalid API key",
-        headers={"WWW-Authenticate": "ApiKey"},
-    )
-
-
-async def require_auth(
-    request: Request,
-    token: Optional[str] = Depends(oauth2_scheme),
-    api_key: Optional[str] = Depends(api_key_header)
-) -> User:
-    """
-    Require either JWT token OR API key.
-
-    Flexible authentication that accepts either method.
-    Useful for endpoints that should work with both users and services.
-
-    Priority:
-    1. JWT token (if provided)
-    2. API key (if provided)
-    3. Raise 401
-
-    Usage:
-        @router.get("/flexible")
-        async def route(user: User = Depends(require_auth)):
-            return {"user": user.username}
-    """
-    # Check if path is public
-    if request.url.path in settings.PUBLIC_PATHS:
-        return User(username="anonymous", disabled=False)
-
-    # Check if auth is disabled
-    if not settings.AUTH_ENABLED:
-        return User(username="dev_user", disabled=False, is_admin=True)
-
-    # Try JWT first
-    if token:
-        try:
-            return await get_current_user(request, token)
-        except HTTPException:
-            pass  # Fall through to try API key
-
-    # Try API key
-    if api_key:
-        try:
-            await verify_api_key(request, api_key)
-            return User(username="api_key_user", disabled=False, is_admin=False)
-        except HTTPException:
-            pass
-
-    # Neither worked
-    raise HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Authentication required. Provide JWT token or API key.",
-        headers={"WWW-Authenticate": "Bearer, ApiKey"},
-    )
-
-
-async def require_admin(
-    current_user: User = Depends(get_current_active_user)
-) -> User:
-    """
-    Require admin privileges.
-
-    Use for admin-only endpoints.
-
-    Raises:
-        HTTPException 403: If user is not an admin
-    """
-    if not current_user.is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin privileges required"
-        )
-    return current_user
+"""
+Authentication Dependencies for FastAPI
+
+FastAPI dependencies are reusable components that:
+1. Run before your endpoint code
+2. Can validate/extract data
+3. Can return values to your endpoint
+4. Handle common tasks like authentication
+
+=== HOW DEPENDENCIES WORK ===
+
+    @router.get("/protected")
+    async def protected_route(user: User = Depends(get_current_user)):
+        # 'user' is automatically populated by get_current_user
+        # If auth fails, HTTP 401 is raised automatically
+        return {"message": f"Hello {user.username}"}
+
+=== AUTHENTICATION FLOW ===
+
+1. Client sends request with header:
+   Authorization: Bearer eyJ0eXAiOiJKV1Q...
+
+2. oauth2_scheme extracts the token
+
+3. get_current_user:
+   - Decodes the token
+   - Looks up the user
+   - Returns User object or raises 401
+
+4. Your endpoint receives the authenticated user
+"""
+
+import hashlib
+import hmac
+import threading
+import time
+from typing import Optional
+from fastapi import Depends, HTTPException, status, Request
+from fastapi.security import OAuth2PasswordBearer, APIKeyHeader
+
+from config.settings import settings
+from .models import User, UserInDB, TokenData
+from .utils import decode_token, verify_and_update_password, verify_password
+
+
+# === OAUTH2 SCHEME ===
+
+# This tells FastAPI where to get the token from
+# tokenUrl is where clients should POST to get a token
+oauth2_scheme = OAuth2PasswordBearer(
+    tokenUrl="/api/v1/auth/token",
+    auto_error=False  # Don't auto-raise, we'll handle it
+)
+
+# API Key header scheme
+api_key_header = APIKeyHeader(
+    name="X-API-Key",
+    auto_error=False  # Don't auto-raise, we'll handle it
+)
+
+
+# === HOT-PATH PRECOMPUTATION ===
+# These dependencies run on EVERY request, so anything constant is
+# built once at import time instead of per request.
+
+# frozenset gives O(1) membership checks vs O(N) list scans
+_PUBLIC_PATHS: frozenset = frozenset(settings.PUBLIC_PATHS)
+
+
+def is_public_path(path: str) -> bool:
+    """Check whether a request path skips authentication."""
+    return path in _PUBLIC_PATHS
+
+
+def _request_is_public(request: Request) -> bool:
+    """
+    Read the public-path flag for this request.
+
+    The middleware in api/main.py classifies the path once per request
+    and stashes the bool on request.state, so the up-to-three auth
+    dependencies that run per request share one membership check. The
+    fallback covers direct calls outside the middleware stack (tests,
+    scripts).
+    """
+    flag = getattr(request.state, "is_public", None)
+    if flag is not None:
+        return flag
+    return is_public_path(request.url.path)
+
+
+# Pydantic model construction isn't free; the anonymous and dev users
+# never change, so reuse one instance (User is read-only downstream)
+_ANONYMOUS_USER = User(username="anonymous", disabled=False)
+_DEV_USER = User(username="dev_user", disabled=False, is_admin=True)
+
+# API key pre-encoded once: compare_digest wants bytes, and encoding
+# per request would allocate a new bytes object on the hot path
+_API_KEY_BYTES: Optional[bytes] = (
+    settings.API_KEY.encode("utf-8") if settings.API_KEY else None
+)
+
+# Short-lived cache of validated tokens. A chatty client reuses the
+# same JWT for every request, so repeat validations within the window
+# skip the HMAC verification + JSON parse + user lookup entirely.
+# Keyed by the token's SHA-256 (never store/log the raw token); entries
+# never outlive the token's own exp claim.
+_TOKEN_CACHE: dict = {}
+_TOKEN_CACHE_TTL_SECONDS = 60.0
+_TOKEN_CACHE_MAX_ENTRIES = 10_000
+_token_cache_lock = threading.Lock()
+
+
+def clear_token_cache() -> None:
+    """Clear cached token validations (call on logout/revocation)."""
+    with _token_cache_lock:
+        _TOKEN_CACHE.clear()
+
+
+# === FAKE USER DATABASE ===
+# In production, replace with real database queries
+
+# The admin row never changes at runtime, so it is built ONCE. This
+# matters in dev mode: without ADMIN_PASSWORD_HASH the fallback hashes
+# "admin123" with bcrypt (~100ms) - previously on EVERY auth request.
+_admin_user: Optional[UserInDB] = None
+_admin_user_lock = threading.Lock()
+
+# Username comparison in bytes form for compare_digest (constant-time;
+# '==' exits at the first differing character, which leaks match length
+# through response timing)
+_ADMIN_USERNAME_BYTES = settings.ADMIN_USERNAME.encode("utf-8")
+
+# Dummy hash for the unknown-user branch. Without it, login attempts
+# against a nonexistent username return in microseconds while real
+# usernames take ~100ms of bcrypt - a clean timing oracle for username
+# enumeration. Built lazily (one bcrypt hash) so imports stay fast.
+_dummy_hash: Optional[str] = None
+_dummy_hash_lock = threading.Lock()
+
+
+def _get_dummy_hash() -> str:
+    """Lazily build the hash used to equalize unknown-user timing."""
+    global _dummy_hash
+
+    if _dummy_hash is None:
+        with _dummy_hash_lock:
+            if _dummy_hash is None:
+                from .utils import get_password_hash
+                _dummy_hash = get_password_hash("timing-equalizer-not-a-password")
+
+    return _dummy_hash
+
+
+def _get_admin_user() -> UserInDB:
+    """Lazily build and cache the admin UserInDB singleton."""
+    global _admin_user
+
+    if _admin_user is None:
+        with _admin_user_lock:
+            if _admin_user is None:
+                # Get password hash from settings (loaded from .env)
+                password_hash = settings.ADMIN_PASSWORD_HASH
+
+                if not password_hash:
+                    # If no hash is set, create a default one for development
+                    # WARNING: Change this in production!
+                    from .utils import get_password_hash
+                    print("[Auth] WARNING: ADMIN_PASSWORD_HASH not set - "
+                          "using default dev password")
+                    password_hash = get_password_hash("admin123")
+
+                _admin_user = UserInDB(
+                    username=settings.ADMIN_USERNAME,
+                    email="admin@example.com",
+                    full_name="Administrator",
+                    disabled=False,
+                    is_admin=True,
+                    password_hash=password_hash
+                )
+
+    return _admin_user
+
+
+def warm_auth_caches() -> None:
+    """
+    Pre-build lazy auth state off the request path.
+
+    Called from app startup (in a worker thread) so the one-time costs
+    paid on first use - most notably the dev-mode bcrypt hash of the
+    default admin password, ~100-300ms - don't land on the first real
+    login. A no-op after the singletons exist, so safe to call again.
+    """
+    _get_admin_user()
+    _get_dummy_hash()
+
+
+def get_user_from_db(username: str) -> Optional[UserInDB]:
+    """
+    Get user from database.
+
+    Currently uses environment variables for the admin user.
+    In production, replace with real database queries.
+
+    Args:
+        username: Username to look up
+
+    Returns:
+        UserInDB if found, None otherwise
+    """
+    # Check if it's the admin user (cached singleton - no per-request
+    # Pydantic construction, and the dev-mode bcrypt hash runs once).
+    # compare_digest keeps the comparison constant-time.
+    if hmac.compare_digest(username.encode("utf-8"), _ADMIN_USERNAME_BYTES):
+        return _get_admin_user()
+
+    return None
+
+
+def authenticate_user(username: str, password: str) -> Optional[UserInDB]:
+    """
+    Authenticate a user by username and password.
+
+    Args:
+        username: The username
+        password: Plain text password
+
+    Returns:
+        UserInDB if credentials valid, None otherwise
+
+    Note:
+        bcrypt verification takes ~100ms by design. From async code
+        (FastAPI login endpoints) use authenticate_user_async instead,
+        which runs the hash in a threadpool so the event loop keeps
+        serving other requests.
+    """
+    user = get_user_from_db(username)
+    if not user:
+        # Burn the same bcrypt cost as a real verification so unknown
+        # usernames aren't detectable by a fast rejection
+        verify_password(password, _get_dummy_hash())
+        return None
+
+    valid, new_hash = verify_and_update_password(password, user.password_hash)
+    if not valid:
+        return None
+
+    if new_hash:
+        _store_upgraded_hash(user, new_hash)
+
+    return user
+
+
+def _store_upgraded_hash(user: UserInDB, new_hash: str) -> None:
+    """
+    Persist a rehashed password computed during login.
+
+    verify_and_update returns a fresh hash when the stored one predates
+    the current cost settings. With the env-backed user store, "persist"
+    means updating the cached record (so this process never rehashes
+    again) and telling the operator to update .env for the next restart.
+    """
+    user.password_hash = new_hash
+    print(f"[Auth] Password hash for '{user.username}' upgraded to current "
+          f"cost settings - update ADMIN_PASSWORD_HASH in .env to persist:")
+    print(f"       {new_hash}")
+
+
+async def authenticate_user_async(username: str, password: str) -> Optional[UserInDB]:
+    """
+    Async variant of authenticate_user for event-loop callers.
+
+    bcrypt is intentionally slow (~100ms); running it inline in an
+    async endpoint stalls the whole event loop for that time - under
+    credential-stuffing load the API stops serving everyone. The
+    verification runs in the anyio threadpool instead - the same pool
+    Starlette uses for sync endpoints, sized at app startup, so login
+    bursts scale across threads (bcrypt's C code releases the GIL).
+    """
+    from starlette.concurrency import run_in_threadpool
+
+    user = get_user_from_db(username)
+    if not user:
+        # Same dummy bcrypt as the sync path: unknown usernames must
+        # cost as much as wrong passwords
+        await run_in_threadpool(verify_password, password, _get_dummy_hash())
+        return None
+
+    valid, new_hash = await run_in_threadpool(
+        verify_and_update_password, password, user.password_hash
+    )
+    if not valid:
+        return None
+
+    if new_hash:
+        _store_upgraded_hash(user, new_hash)
+
+    return user
+
+
+# === DEPENDENCY FUNCTIONS ===
+
+async def get_current_user(
+    request: Request,
+    token: Optional[str] = Depends(oauth2_scheme)
+) -> User:
+    """
+    Get the current authenticated user from JWT token.
+
+    This is the main authentication dependency.
+    Use it to protect endpoints that require login.
+
+    Usage:
+        @router.get("/protected")
+        async def route(user: User = Depends(get_current_user)):
+            return {"user": user.username}
+
+    Raises:
+        HTTPException 401: If token is missing or invalid
+    """
+    # Check if path is public
+    if _request_is_public(request):
+        # Return a dummy user for public paths
+        return _ANONYMOUS_USER
+
+    # Check if auth is disabled (development mode)
+    if not settings.AUTH_ENABLED:
+        return _DEV_USER
+
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    if not token:
+        raise credentials_exception
+
+    # Cache hit: this exact token was validated recently - skip the
+    # signature verification and user lookup
+    cache_key = hashlib.sha256(token.encode()).hexdigest()
+    entry = _TOKEN_CACHE.get(cache_key)
+    if entry is not None:
+        cached_user, expires_at = entry
+        if time.time() < expires_at:
+            return cached_user
+        _TOKEN_CACHE.pop(cache_key, None)
+
+    # Decode the token
+    payload = decode_token(token)
+    if payload is None:
+        raise credentials_exception
+
+    username: str = payload.get("sub")
+    if username is None:
+        raise credentials_exception
+
+    # Get user from database
+    user = get_user_from_db(username)
+    if user is None:
+        raise credentials_exception
+
+    # model_construct skips Pydantic validation - safe here because
+    # every field comes from an already-validated UserInDB, and this
+    # runs on every cache-miss request
+    user_response = User.model_construct(
+        username=user.username,
+        email=user.email,
+        full_name=user.full_name,
+        disabled=user.disabled,
+        is_admin=user.is_admin
+    )
+
+    # Cache the validated result, capped at the token's own expiry so a
+    # cached entry can never outlive the JWT it came from
+    exp = payload.get("exp")
+    ttl = _TOKEN_CACHE_TTL_SECONDS
+    if exp is not None:
+        ttl = min(ttl, exp - time.time())
+
+    if ttl > 0:
+        with _token_cache_lock:
+            if len(_TOKEN_CACHE) >= _TOKEN_CACHE_MAX_ENTRIES:
+                # Drop the oldest insertion (dicts preserve order) so
+                # the cache stays bounded under token churn
+                _TOKEN_CACHE.pop(next(iter(_TOKEN_CACHE)), None)
+            _TOKEN_CACHE[cache_key] = (user_response, time.time() + ttl)
+
+    return user_response
+
+
+async def get_current_active_user(
+    current_user: User = Depends(get_current_user)
+) -> User:
+    """
+    Get current user, but only if account is active.
+
+    Use this instead of get_current_user when you need
+    to ensure the user's account isn't disabled.
+
+    Raises:
+        HTTPException 403: If user account is disabled
+    """
+    if current_user.disabled:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User account is disabled"
+        )
+    return current_user
+
+
+async def verify_api_key(
+    request: Request,
+    api_key: Optional[str] = Depends(api_key_header)
+) -> str:
+    """
+    Verify API key from X-API-Key header.
+
+    Use this for service-to-service authentication.
+
+    Usage:
+        @router.get("/service")
+        async def route(api_key: str = Depends(verify_api_key)):
+            return {"message": "Authorized"}
+
+    Raises:
+        HTTPException 401: If API key is missing or invalid
+    """
+    # Check if path is public
+    if _request_is_public(request):
+        return "public"
+
+    # Check if auth is disabled
+    if not settings.AUTH_ENABLED:
+        return "auth_disabled"
+
+    if not api_key:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="API key required",
+            headers={"WWW-Authenticate": "ApiKey"},
+        )
+
+    # Check against configured API key. compare_digest examines every
+    # byte regardless of where the first mismatch is, so response time
+    # leaks nothing about how much of the key was correct
+    if _API_KEY_BYTES is not None and hmac.compare_digest(
+        api_key.encode("utf-8"), _API_KEY_BYTES
+    ):
+        return api_key
+
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid API key",
+        headers={"WWW-Authenticate": "ApiKey"},
+    )
+
+
+async def require_auth(
+    request: Request,
+    token: Optional[str] = Depends(oauth2_scheme),
+    api_key: Optional[str] = Depends(api_key_header)
+) -> User:
+    """
+    Require either JWT token OR API key.
+
+    Flexible authentication that accepts either method.
+    Useful for endpoints that should work with both users and services.
+
+    Priority:
+    1. JWT token (if provided)
+    2. API key (if provided)
+    3. Raise 401
+
+    Usage:
+        @router.get("/flexible")
+        async def route(user: User = Depends(require_auth)):
+            return {"user": user.username}
+    """
+    # Check if path is public
+    if _request_is_public(request):
+        return _ANONYMOUS_USER
+
+    # Check if auth is disabled
+    if not settings.AUTH_ENABLED:
+        return _DEV_USER
+
+    # Try JWT first
+    if token:
+        try:
+            return await get_current_user(request, token)
+        except HTTPException:
+            pass  # Fall through to try API key
+
+    # Try API key
+    if api_key:
+        try:
+            await verify_api_key(request, api_key)
+            return User(username="api_key_user", disabled=False, is_admin=False)
+        except HTTPException:
+            pass
+
+    # Neither worked
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Authentication required. Provide JWT token or API key.",
+        headers={"WWW-Authenticate": "Bearer, ApiKey"},
+    )
+
+
+async def require_admin(
+    current_user: User = Depends(get_current_active_user)
+) -> User:
+    """
+    Require admin privileges.
+
+    Use for admin-only endpoints.
+
+    Raises:
+        HTTPException 403: If user is not an admin
+    """
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required"
+        )
+    return current_user
@@ -0,0 +1,63 @@
+"""
+Shared HTTP Transport for SDK Clients
+
+Both SDK singletons (groq_client.py, mistral_client.py) build a default
+httpx.Client internally when none is supplied - each with its own small
+connection pool, HTTP/1.1 only. This module provides ONE shared
+transport they can pass in instead.
+
+=== WHY A SHARED CLIENT? ===
+
+1. Connection reuse: a TCP+TLS handshake costs 1-3 round trips
+   (50-150ms to a remote API). A shared keepalive pool pays it once
+   per host, not once per cold client.
+2. HTTP/2 multiplexing: many in-flight vision/OCR requests share one
+   connection instead of queueing on a small HTTP/1.1 pool - this is
+   what keeps tail latency near Groq's ~50ms target under load.
+3. One pool to size: limits are set here once instead of drifting
+   between client modules.
+
+Note: this is the SYNC twin of get_shared_async_client() in
+src/agents/_llm_registry.py, which serves the async LangChain
+wrappers. The SDK singletons here are synchronous, so they need an
+httpx.Client, not an AsyncClient.
+"""
+
+from typing import Optional
+
+import httpx
+
+_shared_http_client: Optional[httpx.Client] = None
+
+
+def get_shared_http_client() -> httpx.Client:
+    """
+    Get or lazily create the shared sync httpx client.
+
+    Returns:
+        httpx.Client with HTTP/2 and a pool sized for bursts of
+        concurrent vision/OCR calls
+    """
+    global _shared_http_client
+
+    if _shared_http_client is None:
+        _shared_http_client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=50,
+            ),
+            timeout=30.0,
+        )
+        print("[HTTP] Created shared HTTP/2 client for SDK singletons")
+
+    return _shared_http_client
+
+
+def close_shared_http_client() -> None:
+    """Close the shared client's pooled connections (tests/shutdown)."""
+    global _shared_http_client
+
+    if _shared_http_client is not None:
+        _shared_http_client.close()
+        _shared_http_client = None
@@ -0,0 +1,20 @@
+"""
+Media Processors - Frame Extraction and Preprocessing (Phase 2)
+
+This package holds CPU-side media processing that runs BEFORE any LLM
+call:
+- video_processor: sampled frame extraction (PyAV seek-based demuxing),
+  NHWC batch layout, batch JPEG encoding
+- face_detector: MediaPipe face detection (GPU delegate, SoA batch API)
+
+Tools in src/tools/ handle the LLM-facing side (Groq vision calls);
+processors handle the decode/sampling side that feeds them.
+"""
+
+from .video_processor import extract_frames, get_video_info, encode_frames_jpeg
+
+__all__ = [
+    "extract_frames",
+    "get_video_info",
+    "encode_frames_jpeg",
+]
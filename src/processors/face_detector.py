@@ -0,0 +1,317 @@
+"""
+Face Detection - MediaPipe with GPU Delegate (Phase 2)
+
+This module wraps MediaPipe's FaceDetector for the video pipeline.
+
+=== WHY THE GPU DELEGATE? ===
+
+MediaPipe face detection on CPU costs 10-50ms per 720p frame - that
+alone blows the video agent's ~50ms end-to-end budget. The GPU delegate
+moves the detector graph onto the GPU (2-5x faster per frame), which is
+what re-enables 30 fps operation on GPU-equipped hosts.
+
+Delegate selection is automatic:
+    1. Try BaseOptions.Delegate.GPU
+    2. Fall back to CPU if GPU init raises (no GPU / no driver)
+
+=== WHY DOWNSAMPLE TO 320x240? ===
+
+Detector latency scales with pixel count (O(H*W)). Downsampling 720p
+to 320x240 is a ~9x pixel reduction, so roughly a 9x detector speedup,
+with minor accuracy loss for short-range faces. Detection boxes are
+returned in normalized coordinates, so downsampling does not change
+the output format.
+
+=== MODES ===
+
+- detect(frame): synchronous, one frame in / results out (VIDEO mode)
+- detect_async(frame, timestamp_ms): LIVE_STREAM mode - push frames,
+  collect results via callback without blocking the caller
+
+Usage:
+    from src.processors.face_detector import get_face_detector
+
+    detector = get_face_detector()
+    faces = detector.detect(rgb_frame)  # list of bounding boxes
+"""
+
+import threading
+import time
+from typing import Callable, List, Optional
+
+import numpy as np
+
+# MediaPipe is a Phase 2 dependency (commented in requirements.txt).
+# Keep the import optional so the package loads without it.
+try:
+    import mediapipe as mp
+    HAS_MEDIAPIPE = True
+except ImportError:
+    mp = None
+    HAS_MEDIAPIPE = False
+
+
+# Input size for the detector: ~9x fewer pixels than 720p
+DETECT_WIDTH = 320
+DETECT_HEIGHT = 240
+
+# Default model asset (download once, see MediaPipe model zoo)
+DEFAULT_MODEL_PATH = "models/blaze_face_short_range.tflite"
+
+
+class FaceDetector:
+    """
+    MediaPipe face detector with GPU delegate and CPU fallback.
+
+    The underlying detector is created lazily on first use so importing
+    this module never pays GPU initialization cost.
+    """
+
+    def __init__(
+        self,
+        model_path: str = DEFAULT_MODEL_PATH,
+        live_stream: bool = False,
+        result_callback: Optional[Callable] = None,
+    ):
+        """
+        Args:
+            model_path: Path to the .tflite face detection model
+            live_stream: Use LIVE_STREAM mode (async push + callback)
+                         instead of per-frame VIDEO mode
+            result_callback: Called with (result, timestamp_ms) for each
+                             frame in live_stream mode
+        """
+        if not HAS_MEDIAPIPE:
+            raise ImportError(
+                "mediapipe not installed. "
+                "Install with: pip install mediapipe"
+            )
+
+        self.model_path = model_path
+        self.live_stream = live_stream
+        self.result_callback = result_callback
+        self.delegate_used: Optional[str] = None
+
+        self._detector = None
+        self._lock = threading.Lock()
+
+    def _build_detector(self, delegate):
+        """Build the MediaPipe detector for one delegate."""
+        BaseOptions = mp.tasks.BaseOptions
+        FaceDetectorOptions = mp.tasks.vision.FaceDetectorOptions
+        VisionRunningMode = mp.tasks.vision.RunningMode
+
+        if self.live_stream:
+            options = FaceDetectorOptions(
+                base_options=BaseOptions(
+                    model_asset_path=self.model_path,
+                    delegate=delegate,
+                ),
+                running_mode=VisionRunningMode.LIVE_STREAM,
+                result_callback=self._on_result,
+            )
+        else:
+            options = FaceDetectorOptions(
+                base_options=BaseOptions(
+                    model_asset_path=self.model_path,
+                    delegate=delegate,
+                ),
+                running_mode=VisionRunningMode.VIDEO,
+            )
+
+        return mp.tasks.vision.FaceDetector.create_from_options(options)
+
+    def _get_detector(self):
+        """Lazily create the detector: GPU first, CPU fallback."""
+        if self._detector is None:
+            with self._lock:
+                if self._detector is None:
+                    BaseOptions = mp.tasks.BaseOptions
+                    try:
+                        self._detector = self._build_detector(
+                            BaseOptions.Delegate.GPU
+                        )
+                        self.delegate_used = "GPU"
+                        print("[FaceDetector] Using GPU delegate")
+                    except Exception as e:
+                        print(f"[FaceDetector] GPU delegate unavailable "
+                              f"({e}), falling back to CPU")
+                        self._detector = self._build_detector(
+                            BaseOptions.Delegate.CPU
+                        )
+                        self.delegate_used = "CPU"
+
+        return self._detector
+
+    def _downsample(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Downsample to DETECT_WIDTH x DETECT_HEIGHT before detection.
+
+        Detector latency is O(H*W); boxes come back normalized, so the
+        caller can still map them onto the full-resolution frame.
+        """
+        h, w = frame.shape[:2]
+        if w <= DETECT_WIDTH and h <= DETECT_HEIGHT:
+            return frame
+
+        import cv2
+        return cv2.resize(
+            frame,
+            (DETECT_WIDTH, DETECT_HEIGHT),
+            interpolation=cv2.INTER_AREA,
+        )
+
+    def detect(self, frame: np.ndarray, timestamp_ms: Optional[int] = None) -> List[dict]:
+        """
+        Detect faces in one RGB frame (synchronous).
+
+        Args:
+            frame: RGB uint8 array of shape (H, W, 3)
+            timestamp_ms: Frame timestamp; defaults to wall clock
+
+        Returns:
+            List of detections, each a dict with a normalized bounding
+            box and confidence score
+        """
+        detector = self._get_detector()
+
+        if timestamp_ms is None:
+            timestamp_ms = int(time.time() * 1000)
+
+        small = self._downsample(frame)
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=small)
+
+        result = detector.detect_for_video(mp_image, timestamp_ms)
+
+        detections = []
+        for det in result.detections:
+            box = det.bounding_box
+            detections.append({
+                # Normalize against the DOWNSAMPLED size so boxes map
+                # directly onto any resolution of the source frame
+                "box": {
+                    "x": box.origin_x / small.shape[1],
+                    "y": box.origin_y / small.shape[0],
+                    "width": box.width / small.shape[1],
+                    "height": box.height / small.shape[0],
+                },
+                "score": det.categories[0].score if det.categories else 0.0,
+            })
+
+        return detections
+
+    def detect_async(self, frame: np.ndarray, timestamp_ms: int) -> None:
+        """
+        Push one frame for LIVE_STREAM detection (non-blocking).
+
+        Results arrive via the result_callback passed to __init__, so
+        the video agent can keep pushing frames while detection runs.
+        """
+        if not self.live_stream:
+            raise RuntimeError("detect_async requires live_stream=True")
+
+        detector = self._get_detector()
+        small = self._downsample(frame)
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=small)
+        detector.detect_async(mp_image, timestamp_ms)
+
+    def _on_result(self, result, output_image, timestamp_ms: int) -> None:
+        """Internal LIVE_STREAM callback; forwards to the user callback."""
+        if self.result_callback is not None:
+            self.result_callback(result, timestamp_ms)
+
+    def close(self) -> None:
+        """Release the underlying detector."""
+        if self._detector is not None:
+            self._detector.close()
+            self._detector = None
+
+
+# Maximum faces tracked per frame in batch results (fixed so the SoA
+# arrays below have a static shape)
+MAX_FACES_PER_FRAME = 5
+
+
+def detect_faces_batch(frames: np.ndarray, detector: Optional["FaceDetector"] = None):
+    """
+    Run face detection over an NHWC frame batch, returning SoA arrays.
+
+    Instead of a list of per-frame dicts (AoS - pointer-chasing, poor
+    cache locality), results come back as parallel structure-of-arrays
+    buffers with one row per frame:
+
+        bboxes: (N, MAX_FACES_PER_FRAME, 4) float32 - normalized
+                [x, y, width, height], zero-padded past face_counts[i]
+        scores: (N, MAX_FACES_PER_FRAME) float32
+        face_counts: (N,) int32
+
+    Downstream consumers (emotion heads, overlap filters, aggregation)
+    can then operate on whole columns with single NumPy expressions.
+
+    Args:
+        frames: uint8 RGB batch of shape (N, H, W, 3), e.g. from
+                src.processors.video_processor.extract_frames
+        detector: Optional detector instance (defaults to the shared one)
+
+    Returns:
+        (bboxes, scores, face_counts) numpy arrays
+    """
+    if detector is None:
+        detector = get_face_detector()
+
+    n = frames.shape[0]
+    bboxes = np.zeros((n, MAX_FACES_PER_FRAME, 4), dtype=np.float32)
+    scores = np.zeros((n, MAX_FACES_PER_FRAME), dtype=np.float32)
+    face_counts = np.zeros(n, dtype=np.int32)
+
+    for i in range(n):
+        detections = detector.detect(frames[i])
+        count = min(len(detections), MAX_FACES_PER_FRAME)
+        face_counts[i] = count
+        for j in range(count):
+            box = detections[j]["box"]
+            bboxes[i, j] = (box["x"], box["y"], box["width"], box["height"])
+            scores[i, j] = detections[j]["score"]
+
+    return bboxes, scores, face_counts
+
+
+# Singleton for the default (synchronous) detector
+_face_detector: Optional[FaceDetector] = None
+_face_detector_lock = threading.Lock()
+
+
+def get_face_detector() -> FaceDetector:
+    """Get or create the shared synchronous face detector."""
+    global _face_detector
+
+    if _face_detector is None:
+        with _face_detector_lock:
+            if _face_detector is None:
+                _face_detector = FaceDetector()
+
+    return _face_detector
+
+
+# For testing
+if __name__ == "__main__":
+    print("=" * 60)
+    print("FACE DETECTOR - MediaPipe GPU/CPU Test")
+    print("=" * 60)
+    print(f"\nMediaPipe available: {HAS_MEDIAPIPE}")
+
+    if not HAS_MEDIAPIPE:
+        print("\nInstall with: pip install mediapipe")
+        print("And download the model: blaze_face_short_range.tflite")
+        exit(0)
+
+    detector = get_face_detector()
+    test_frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+
+    start = time.time()
+    faces = detector.detect(test_frame)
+    elapsed_ms = (time.time() - start) * 1000
+
+    print(f"\nDelegate: {detector.delegate_used}")
+    print(f"Detections: {len(faces)}")
+    print(f"Latency: {elapsed_ms:.1f}ms")
@@ -0,0 +1,353 @@
+"""
+Video Frame Extraction - Seek-Based Sampling with PyAV
+
+This module extracts sampled frames from video files for the video
+agent's vision pipeline (Groq Vision / MediaPipe in Phase 2).
+
+=== WHY PYAV INSTEAD OF AN OPENCV FRAME LOOP? ===
+
+The naive approach decodes EVERY frame just to keep a few:
+
+    cap = cv2.VideoCapture(path)
+    while cap.read(): ...  # decodes 30 frames to keep 1 at 1 fps
+
+At 1 fps sampling on 30 fps video that wastes ~29/30 of the decode work
+(CPU + memory bandwidth). PyAV exposes libav's demuxer directly, so we
+can SEEK to each target timestamp and decode only the frames we keep:
+
+    container.seek(target_pts, stream=video_stream)
+    frame = next(container.decode(video=0))
+
+Expected impact: ~10-30x fewer decoded frames for sparse sampling.
+
+=== OUTPUT FORMAT ===
+
+Frames are returned as one preallocated numpy batch of shape
+(N, H, W, 3) in RGB uint8 - ready for MediaPipe or base64 encoding for
+Groq vision calls, with no per-frame list/copy overhead.
+
+=== FALLBACK ===
+
+If PyAV is not installed, falls back to OpenCV with grab()-based frame
+skipping (decode is still skipped for dropped frames since grab() only
+demuxes; retrieve() is called just for kept frames).
+
+Usage:
+    from src.processors import extract_frames
+
+    frames, timestamps = extract_frames("video.mp4", target_fps=1.0)
+    print(frames.shape)  # (N, H, W, 3)
+"""
+
+from functools import lru_cache
+from typing import List, Tuple
+
+import numpy as np
+
+# PyAV is the preferred decoder (seek-based sampling). Optional so the
+# package still imports in environments that only have OpenCV.
+try:
+    import av
+    HAS_PYAV = True
+except ImportError:
+    av = None
+    HAS_PYAV = False
+
+
+def get_video_info(video_path: str) -> dict:
+    """
+    Get basic metadata for a video file.
+
+    Args:
+        video_path: Path to the video file
+
+    Returns:
+        Dict with duration (seconds), fps, width, height, total_frames
+    """
+    if HAS_PYAV:
+        with av.open(video_path) as container:
+            stream = container.streams.video[0]
+            fps = float(stream.average_rate or 30)
+            duration = float(
+                (stream.duration or 0) * stream.time_base
+            ) or float((container.duration or 0) / av.time_base)
+            return {
+                "duration": duration,
+                "fps": fps,
+                "width": stream.codec_context.width,
+                "height": stream.codec_context.height,
+                "total_frames": stream.frames or int(duration * fps),
+            }
+
+    import cv2
+    cap = cv2.VideoCapture(video_path)
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        return {
+            "duration": total / fps if fps else 0.0,
+            "fps": fps,
+            "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            "total_frames": total,
+        }
+    finally:
+        cap.release()
+
+
+# Codec name -> NVDEC (cuvid) decoder name for the GPU decode path
+_NVDEC_CODEC_MAP = {
+    "h264": "h264_cuvid",
+    "hevc": "hevc_cuvid",
+    "vp9": "vp9_cuvid",
+    "av1": "av1_cuvid",
+}
+
+
+@lru_cache(maxsize=1)
+def _has_cuda() -> bool:
+    """Check once whether an NVIDIA GPU/driver is visible on this host."""
+    import shutil
+    return shutil.which("nvidia-smi") is not None
+
+
+def _create_nvdec_decoder(stream):
+    """
+    Try to create an NVDEC (cuvid) decoder context for this stream.
+
+    NVDEC runs H.264/HEVC decode on the GPU's dedicated decode block -
+    5-10x faster than CPU decode and it leaves the CPU cores free for
+    detection. Returns None when no cuvid decoder exists for the codec
+    or FFmpeg was built without CUDA support (callers fall back to the
+    standard software decoder).
+    """
+    codec_name = _NVDEC_CODEC_MAP.get(stream.codec_context.name)
+    if codec_name is None:
+        return None
+
+    try:
+        ctx = av.Codec(codec_name, "r").create()
+        ctx.extradata = stream.codec_context.extradata
+        return ctx
+    except Exception:
+        return None
+
+
+def _decode_at(container, stream, nvdec_ctx, target_t):
+    """
+    Decode forward from the current (post-seek) position to the first
+    frame at/after target_t, via NVDEC when available.
+
+    Seeking lands on the keyframe at or before target_t; the frames
+    between that keyframe and the target still get decoded (they are
+    reference frames for it), but only the target frame is returned.
+    Without this roll-forward every sample inside one GOP would be the
+    same keyframe. Frames that carry no timestamp are returned as-is -
+    there is nothing to compare against.
+    """
+    if nvdec_ctx is None:
+        for frame in container.decode(video=0):
+            if frame.time is None or frame.time >= target_t:
+                return frame
+        raise StopIteration
+
+    # Hardware path: demux packets ourselves and feed the cuvid decoder
+    # (it may buffer a few packets before emitting the first frame)
+    for packet in container.demux(stream):
+        for frame in nvdec_ctx.decode(packet):
+            if frame.time is None or frame.time >= target_t:
+                return frame
+    raise StopIteration
+
+
+def extract_frames(
+    video_path: str,
+    target_fps: float = 1.0,
+    max_frames: int = 60,
+    decode_backend: str = "auto",
+) -> Tuple[np.ndarray, List[float]]:
+    """
+    Extract frames at target_fps using seek-based sampling.
+
+    Instead of decoding every frame and discarding most, this seeks the
+    demuxer to each target timestamp and decodes only the nearest frame.
+
+    Args:
+        video_path: Path to the video file
+        target_fps: How many frames per second of video to keep (1.0 =
+                    one frame per second)
+        max_frames: Hard cap on extracted frames (bounds memory)
+        decode_backend: "auto" (NVDEC when a GPU is visible, else CPU),
+                        "nvdec" (force GPU decode), or "cpu"
+
+    Returns:
+        (frames, timestamps) where frames is a preallocated uint8 array
+        of shape (N, H, W, 3) in RGB and timestamps lists each frame's
+        position in seconds
+
+    Raises:
+        FileNotFoundError: If the video file does not exist
+        ValueError: If the file has no video stream
+    """
+    if HAS_PYAV:
+        return _extract_frames_pyav(video_path, target_fps, max_frames, decode_backend)
+    return _extract_frames_opencv(video_path, target_fps, max_frames)
+
+
+def _extract_frames_pyav(
+    video_path: str,
+    target_fps: float,
+    max_frames: int,
+    decode_backend: str,
+) -> Tuple[np.ndarray, List[float]]:
+    """PyAV path: seek to each target timestamp, decode one frame."""
+    with av.open(video_path) as container:
+        if not container.streams.video:
+            raise ValueError(f"No video stream in {video_path}")
+
+        stream = container.streams.video[0]
+
+        # GPU decode: "nvdec" forces it, "auto" uses it when a GPU is
+        # visible; any failure falls back to the software decoder
+        nvdec_ctx = None
+        if decode_backend == "nvdec" or (decode_backend == "auto" and _has_cuda()):
+            nvdec_ctx = _create_nvdec_decoder(stream)
+
+        fps = float(stream.average_rate or 30)
+        duration = float((stream.duration or 0) * stream.time_base)
+        if duration <= 0 and container.duration:
+            duration = container.duration / av.time_base
+
+        step = 1.0 / target_fps
+        num_targets = min(max_frames, max(1, int(duration / step) + 1))
+
+        height = stream.codec_context.height
+        width = stream.codec_context.width
+
+        # Preallocate the whole batch once (SoA-style) so decoded frames
+        # land directly in the output buffer - no per-frame list growth
+        frames = np.empty((num_targets, height, width, 3), dtype=np.uint8)
+        timestamps: List[float] = []
+
+        count = 0
+        for i in range(num_targets):
+            target_t = i * step
+            # Seek lands on the keyframe at/before target_t; _decode_at
+            # then rolls the decoder forward within that GOP to the
+            # frame actually at the target
+            container.seek(int(target_t / stream.time_base), stream=stream)
+            try:
+                frame = _decode_at(container, stream, nvdec_ctx, target_t)
+            except StopIteration:
+                break
+            frames[count] = frame.to_ndarray(format="rgb24")
+            # Explicit None check: frame.time == 0.0 is a legitimate
+            # timestamp and must not be replaced by the target
+            timestamps.append(target_t if frame.time is None else float(frame.time))
+            count += 1
+
+        backend = "NVDEC" if nvdec_ctx is not None else "PyAV"
+        print(f"[VideoProcessor] Extracted {count} frames "
+              f"({target_fps} fps sampling, {fps:.1f} fps source, {backend})")
+        return frames[:count], timestamps
+
+
+def _extract_frames_opencv(
+    video_path: str,
+    target_fps: float,
+    max_frames: int,
+) -> Tuple[np.ndarray, List[float]]:
+    """
+    OpenCV fallback: grab()-based skipping.
+
+    grab() only demuxes/advances without decoding pixels; retrieve() is
+    called just for the frames we keep, so dropped frames still skip the
+    expensive colour conversion.
+    """
+    import cv2
+
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        cap.release()
+        raise FileNotFoundError(f"Could not open video: {video_path}")
+
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        keep_every = max(1, round(fps / target_fps))
+
+        kept: List[np.ndarray] = []
+        timestamps: List[float] = []
+        index = 0
+
+        while len(kept) < max_frames:
+            if not cap.grab():
+                break
+            if index % keep_every == 0:
+                ok, frame = cap.retrieve()
+                if not ok:
+                    break
+                # OpenCV decodes BGR; the pipeline (Groq/MediaPipe) wants RGB
+                kept.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+                timestamps.append(index / fps)
+            index += 1
+
+        if not kept:
+            return np.empty((0, 0, 0, 3), dtype=np.uint8), []
+
+        frames = np.stack(kept)
+        print(f"[VideoProcessor] Extracted {len(kept)} frames "
+              f"({target_fps} fps sampling, {fps:.1f} fps source, OpenCV fallback)")
+        return frames, timestamps
+    finally:
+        cap.release()
+
+
+def encode_frames_jpeg(frames: np.ndarray, quality: int = 85) -> List[bytes]:
+    """
+    JPEG-encode an NHWC frame batch for the vision API.
+
+    One tight loop over the leading axis of the contiguous batch - each
+    cv2.imencode call reads a cache-friendly contiguous slice, and the
+    output bytes go straight into base64/data-URL building for Groq.
+
+    Args:
+        frames: uint8 RGB batch of shape (N, H, W, 3)
+        quality: JPEG quality (85 balances size vs fidelity for VLMs)
+
+    Returns:
+        List of JPEG-encoded bytes, one per frame
+    """
+    import cv2
+
+    params = [cv2.IMWRITE_JPEG_QUALITY, quality]
+    encoded = []
+    for frame in frames:
+        # imencode wants BGR; frames are stored RGB for MediaPipe/Groq
+        ok, buf = cv2.imencode(".jpg", cv2.cvtColor(frame, cv2.COLOR_RGB2BGR), params)
+        if not ok:
+            raise ValueError("JPEG encoding failed")
+        encoded.append(buf.tobytes())
+
+    return encoded
+
+
+# For testing
+if __name__ == "__main__":
+    import sys
+
+    print("=" * 60)
+    print("VIDEO PROCESSOR - Frame Extraction Test")
+    print("=" * 60)
+    print(f"\nPyAV available: {HAS_PYAV}")
+
+    if len(sys.argv) < 2:
+        print("\nUsage: python -m src.processors.video_processor <video_path>")
+        sys.exit(0)
+
+    path = sys.argv[1]
+    info = get_video_info(path)
+    print(f"\nVideo info: {info}")
+
+    frames, timestamps = extract_frames(path, target_fps=1.0)
+    print(f"Batch shape: {frames.shape}")
+    print(f"Timestamps: {[f'{t:.2f}s' for t in timestamps[:10]]}")
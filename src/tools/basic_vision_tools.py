@@ -0,0 +1,489 @@
+"""
+Basic Vision Tools - Local Image Analysis (No LLM Required)
+
+These tools answer simple image questions with local NumPy math instead
+of a vision-model round-trip. They complement the Groq tools in
+video_tools.py: when the question is "what are the dominant colors" or
+"how big is this image", burning a ~50ms LLM call is waste.
+
+=== WHY VECTORIZED? ===
+
+Dominant-color extraction with a pure-Python pixel loop costs hundreds
+of milliseconds per image. The NumPy version below:
+    1. Downsamples to 64x64 first (4096 pixels carry the palette -
+       color statistics survive aggressive downsampling)
+    2. Quantizes channels to 32 levels, packs each pixel into one
+       15-bit key, and counts with np.bincount into 32768 fixed
+       buckets - one vectorized pass, bounded memory regardless of
+       how many distinct colors the source image has
+Total: <10ms per image, inside the ~50ms robotics budget.
+
+MiniBatchKMeans would give slightly smoother palettes, but scikit-learn
+is not a dependency of this tree and bin-counting is accurate enough
+for palette reporting.
+
+=== TOOL PATTERN ===
+
+Same conventions as mistral_ocr_tools.py / video_tools.py:
+  1. @tool decorator from langchain_core.tools
+  2. Detailed docstrings for AI agent understanding
+  3. JSON string returns with success/error fields
+  4. Export list: BASIC_VISION_TOOLS = [...]
+"""
+
+import json
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+from langchain_core.tools import tool
+
+# Results are cached by image content hash - color palettes are
+# deterministic, so repeat calls on the same bytes are free
+from src.tools.vision_cache import make_cache_key, vision_cache_get, vision_cache_put
+
+
+# Downsample target: 64x64 = 4096 pixels, plenty for palette statistics
+_PALETTE_SIZE = (64, 64)
+
+# Channel quantization: 256 levels -> 32 (8-wide bins) merges near-
+# identical shades so the top colors are perceptually distinct
+_QUANT_SHIFT = 3
+
+# Below this pixel count an image fails quality screening outright
+# (VGA; too small for useful vision analysis regardless of sharpness)
+_MIN_QUALITY_PIXELS = 640 * 480
+
+
+def _dominant_colors(pixels: np.ndarray, top_k: int = 5):
+    """
+    Find the top_k dominant colors in an (N, 3) uint8 pixel array.
+
+    Fully vectorized: quantize -> pack RGB into one 15-bit key per
+    pixel -> np.bincount -> argpartition. The quantized channels fit in
+    5 bits each, so the whole color space collapses to 32768 fixed
+    buckets: bincount fills them in one O(N) pass with a bounded
+    working set (no hashing, no per-unique-color growth), and
+    argpartition picks the top_k without fully sorting the histogram.
+
+    Returns:
+        List of (rgb_tuple, fraction) pairs, most common first
+    """
+    # Quantize each channel into 32 bins, then pack the three 5-bit
+    # values into a single 15-bit key per pixel. The quantized planes
+    # stay uint8; only the key accumulator is widened, and the
+    # shift/OR chain runs in place so no intermediate full-width
+    # arrays are allocated
+    q = pixels >> _QUANT_SHIFT
+    keys = q[:, 0].astype(np.uint32)
+    keys <<= 5
+    keys |= q[:, 1]
+    keys <<= 5
+    keys |= q[:, 2]
+
+    hist = np.bincount(keys, minlength=1 << 15)
+
+    # Partial-select the top_k occupied buckets, order them descending
+    k = min(top_k, int((hist > 0).sum()))
+    top = np.argpartition(hist, -k)[-k:]
+    top = top[np.argsort(-hist[top])]
+
+    total = float(pixels.shape[0])
+    half_bin = 1 << (_QUANT_SHIFT - 1)
+
+    return [
+        # Unpack and report the bin center (+4 reads truer than the floor)
+        (
+            (
+                ((int(v) >> 10) << _QUANT_SHIFT) + half_bin,
+                (((int(v) >> 5) & 31) << _QUANT_SHIFT) + half_bin,
+                ((int(v) & 31) << _QUANT_SHIFT) + half_bin,
+            ),
+            float(hist[v] / total),
+        )
+        for v in top
+    ]
+
+
+def _color_names(top_rgb: np.ndarray) -> np.ndarray:
+    """
+    Name each color in an (N, 3) array of RGB values.
+
+    One np.select over boolean masks for the whole array - no
+    per-color Python branching. First matching condition wins, so
+    achromatic checks (black/white/gray) come before hue checks.
+
+    Returns:
+        Array of N name strings ("red", "gray", ..., "mixed")
+    """
+    r = top_rgb[:, 0].astype(np.int32)
+    g = top_rgb[:, 1].astype(np.int32)
+    b = top_rgb[:, 2].astype(np.int32)
+
+    spread = np.maximum(np.maximum(r, g), b) - np.minimum(np.minimum(r, g), b)
+    achromatic = spread < 40
+
+    conditions = [
+        achromatic & (r < 60),
+        achromatic & (r > 200),
+        achromatic,
+        (r > g + 40) & (r > b + 40) & (g > b + 40),   # red high, green mid
+        (r > g + 40) & (r > b + 40),
+        (g > r + 40) & (g > b + 40),
+        (b > r + 40) & (b > g + 40),
+        (r > b + 40) & (g > b + 40),
+        (g > r + 40) & (b > r + 40),
+        (r > g + 40) & (b > g + 40),
+    ]
+    choices = [
+        "black", "white", "gray",
+        "orange", "red", "green", "blue",
+        "yellow", "cyan", "magenta",
+    ]
+
+    return np.select(conditions, choices, default="mixed")
+
+
+@tool
+def analyze_image_colors(image_path: str, top_k: int = 5) -> str:
+    """
+    Extract the dominant colors from an image (fast, local, no LLM).
+
+    Use this tool when the user asks about colors, palettes, or tone:
+    - "What are the main colors in this image?"
+    - "Is this image mostly dark or light?"
+    - Brand/palette extraction from logos or screenshots
+
+    This runs locally in <10ms - prefer it over analyze_image for pure
+    color questions.
+
+    Args:
+        image_path: Path to the image file (jpg, png, webp, etc.)
+        top_k: Number of dominant colors to return (default 5)
+
+    Returns:
+        JSON string with:
+        - success: Whether the analysis succeeded
+        - dominant_colors: List of {rgb, hex, name, fraction} entries,
+          most common first
+        - brightness: Mean luminance 0-255
+        - is_dark: Whether the image is predominantly dark
+        - is_monochrome: Whether one color bucket covers >95% of the
+          image (logos, blank frames, solid backgrounds)
+
+    Example:
+        >>> result = analyze_image_colors("/path/to/logo.png")
+        >>> data = json.loads(result)
+        >>> print(data["dominant_colors"][0]["hex"])
+    """
+    try:
+        from PIL import Image
+
+        path = Path(image_path)
+        if not path.exists():
+            return json.dumps({
+                "success": False,
+                "error": f"Image not found: {image_path}"
+            })
+
+        # Hash the raw bytes for the cache key; palettes are
+        # deterministic so hits can skip the whole computation
+        image_bytes = path.read_bytes()
+        cache_key = make_cache_key(image_bytes, f"colors:{top_k}", "local")
+        cached = vision_cache_get(cache_key)
+        if cached is not None:
+            return cached["response"]
+
+        # Downsample BEFORE converting to array: 64x64 keeps the
+        # palette while cutting the pixel count ~100-1000x. draft()
+        # pushes the downsampling into the JPEG decoder itself
+        # (DCT-domain scaling), so a 12MP photo is never materialized
+        # at full resolution; it is a no-op for other formats.
+        img = Image.open(path)
+        img.draft("RGB", _PALETTE_SIZE)
+        img = img.convert("RGB").resize(_PALETTE_SIZE, Image.BILINEAR)
+        pixels = np.asarray(img, dtype=np.uint8).reshape(-1, 3)
+
+        colors = _dominant_colors(pixels, top_k=top_k)
+        names = _color_names(np.array([rgb for rgb, _ in colors], dtype=np.int32))
+
+        # Rec. 601 luma weights, vectorized over all pixels at once
+        # (the matmul yields per-pixel luma; mean() collapses it to the
+        # scalar BEFORE the float() conversion)
+        brightness = float((pixels @ np.array([0.299, 0.587, 0.114])).mean())
+
+        result = json.dumps({
+            "success": True,
+            "dominant_colors": [
+                {
+                    "rgb": list(rgb),
+                    "hex": "#{:02x}{:02x}{:02x}".format(*rgb),
+                    "name": str(name),
+                    "fraction": round(fraction, 4),
+                }
+                for (rgb, fraction), name in zip(colors, names)
+            ],
+            "brightness": round(brightness, 1),
+            "is_dark": brightness < 100,
+            # One bucket owning >95% of the pixels means a logo/solid
+            # background - the histogram is already computed, so this
+            # is a free read of the top fraction
+            "is_monochrome": bool(colors and colors[0][1] > 0.95),
+            "file_processed": str(image_path)
+        }, indent=2)
+
+        vision_cache_put(cache_key, {"response": result})
+        return result
+
+    except Exception as e:
+        return json.dumps({
+            "success": False,
+            "error": str(e),
+            "file_attempted": str(image_path)
+        })
+
+
+@tool
+def detect_image_quality_issues(image_path: str) -> str:
+    """
+    Check an image for quality problems (blur, exposure, contrast).
+
+    Use this tool before expensive vision analysis to decide whether
+    an image is worth sending to a vision model:
+    - "Is this frame too blurry to analyze?"
+    - "Is this photo over/under-exposed?"
+
+    Runs locally with OpenCV - no LLM call.
+
+    Args:
+        image_path: Path to the image file
+
+    Returns:
+        JSON string with:
+        - success: Whether the check succeeded
+        - blur_score: Laplacian variance (higher = sharper)
+        - is_blurry: True below the common threshold of 100
+        - brightness: Mean gray level 0-255
+        - is_dark / is_bright: Exposure flags
+        - contrast: Gray-level standard deviation
+        - is_low_contrast: True below 40
+        - is_low_resolution: True below 640x480 pixels (rejected from
+          header alone, without decoding)
+    """
+    try:
+        import cv2
+        from PIL import Image
+
+        path = Path(image_path)
+        if not path.exists():
+            return json.dumps({
+                "success": False,
+                "error": f"Image not found: {image_path}"
+            })
+
+        # Header-only peek: PIL reads dimensions without decoding a
+        # pixel, so undersized images are rejected in sub-millisecond
+        # time instead of after a full (possibly multi-second) decode
+        with Image.open(path) as im:
+            width, height = im.size
+
+        if width * height < _MIN_QUALITY_PIXELS:
+            return json.dumps({
+                "success": True,
+                "is_low_resolution": True,
+                "width": width,
+                "height": height,
+                "note": "Image below 640x480 - pixel-level checks skipped",
+                "file_processed": str(image_path)
+            }, indent=2)
+
+        # Grayscale decode: every metric below is luminance-only, so
+        # skip the color planes entirely
+        gray = cv2.imread(str(path), cv2.IMREAD_GRAYSCALE)
+        if gray is None:
+            return json.dumps({
+                "success": False,
+                "error": f"Could not decode image: {image_path}"
+            })
+
+        # Blur/contrast statistics are stable under downsampling; cap
+        # the longest edge so a 12MP photo doesn't cost 12MP of math
+        scale = min(1.0, 512 / max(height, width))
+        if scale < 1.0:
+            gray = cv2.resize(gray, None, fx=scale, fy=scale,
+                              interpolation=cv2.INTER_AREA)
+
+        # One fused SIMD pass for mean AND std (instead of separate
+        # .mean() and .std() walks over the same bytes)
+        mean, std = cv2.meanStdDev(gray)
+        brightness = float(mean[0, 0])
+        contrast = float(std[0, 0])
+
+        # Variance of the Laplacian: the standard single-number blur
+        # metric (sharp edges -> high second-derivative energy).
+        # CV_16S holds the full 3x3 Laplacian range of 8-bit input in
+        # a quarter of CV_64F's scratch buffer, and meanStdDev gets
+        # the variance in one SIMD pass instead of .var()'s two
+        lap = cv2.Laplacian(gray, cv2.CV_16S)
+        _, lap_std = cv2.meanStdDev(lap)
+        blur_score = float(lap_std[0, 0]) ** 2
+
+        return json.dumps({
+            "success": True,
+            "blur_score": round(blur_score, 1),
+            "is_blurry": blur_score < 100,
+            "brightness": round(brightness, 1),
+            "is_dark": brightness < 60,
+            "is_bright": brightness > 200,
+            "contrast": round(contrast, 1),
+            "is_low_contrast": contrast < 40,
+            "is_low_resolution": False,
+            "width": width,
+            "height": height,
+            "file_processed": str(image_path)
+        }, indent=2)
+
+    except Exception as e:
+        return json.dumps({
+            "success": False,
+            "error": str(e),
+            "file_attempted": str(image_path)
+        })
+
+
+@tool
+def get_image_info(image_path: str) -> str:
+    """
+    Get basic metadata for an image file (dimensions, format, size).
+
+    Use this tool for questions about image properties that need no
+    visual understanding:
+    - "How big is this image?"
+    - "What format is this file?"
+
+    Args:
+        image_path: Path to the image file
+
+    Returns:
+        JSON string with width, height, format, mode, and file size
+    """
+    try:
+        from PIL import Image
+
+        path = Path(image_path)
+
+        # One stat covers both the existence check and the size -
+        # exists() is itself a stat syscall, and on network mounts
+        # every stat is a round-trip
+        try:
+            file_size = path.stat().st_size
+        except FileNotFoundError:
+            return json.dumps({
+                "success": False,
+                "error": f"Image not found: {image_path}"
+            })
+
+        # Image.open reads only the header - dimensions, format, and
+        # mode come without decoding a single pixel
+        with Image.open(path) as img:
+            return json.dumps({
+                "success": True,
+                "width": img.width,
+                "height": img.height,
+                "format": img.format,
+                "mode": img.mode,
+                "file_size_bytes": file_size,
+                "file_processed": str(image_path)
+            }, indent=2)
+
+    except Exception as e:
+        return json.dumps({
+            "success": False,
+            "error": str(e)
+        })
+
+
+@tool
+def batch_detect_image_quality_issues(image_paths: List[str]) -> str:
+    """
+    Run the quality check over many images concurrently.
+
+    Use this for directory-scale questions ("which of these frames are
+    too blurry?"). Decode dominates the per-image cost and OpenCV
+    releases the GIL while decoding, so a thread pool scales across
+    cores instead of checking images one by one.
+
+    Args:
+        image_paths: List of image file paths
+
+    Returns:
+        JSON string with:
+        - results: One detect_image_quality_issues result per input,
+          in the same order as image_paths
+        - image_count: Number of images checked
+        - blurry_count: How many were flagged blurry
+    """
+    try:
+        from concurrent.futures import ThreadPoolExecutor
+
+        if not image_paths:
+            return json.dumps({
+                "success": False,
+                "error": "No image paths provided"
+            })
+
+        workers = min(8, len(image_paths))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            raw = list(pool.map(detect_image_quality_issues.invoke, image_paths))
+
+        results = [json.loads(r) for r in raw]
+
+        return json.dumps({
+            "success": True,
+            "results": results,
+            "image_count": len(results),
+            "blurry_count": sum(1 for r in results if r.get("is_blurry")),
+        }, indent=2)
+
+    except Exception as e:
+        return json.dumps({
+            "success": False,
+            "error": str(e)
+        })
+
+
+# === LIST OF ALL TOOLS ===
+
+BASIC_VISION_TOOLS = [
+    analyze_image_colors,
+    detect_image_quality_issues,
+    batch_detect_image_quality_issues,
+    get_image_info,
+]
+
+
+# === TEST ===
+
+if __name__ == "__main__":
+    """
+    Test the basic vision tools.
+    Run: python src/tools/basic_vision_tools.py <image_path>
+    """
+    import sys
+    import time
+
+    print("Basic Vision Tools Test")
+    print("=" * 50)
+
+    if len(sys.argv) < 2:
+        print("\nUsage: python src/tools/basic_vision_tools.py <image_path>")
+        exit(0)
+
+    path = sys.argv[1]
+
+    start = time.time()
+    result = analyze_image_colors.invoke({"image_path": path})
+    elapsed_ms = (time.time() - start) * 1000
+
+    print(f"\nColors ({elapsed_ms:.1f}ms):")
+    print(result)
@@ -28,20 +28,43 @@ import os
 import base64
 import json
 import time
+import math
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 from langchain_core.tools import tool
 
 # Import our singleton client
 from src.clients.groq_client import get_groq_client, is_groq_available, get_recommended_vision_model
 
+# Response cache keyed by image content hash (skip repeated vision calls)
+from src.tools.vision_cache import make_cache_key, vision_cache_get, vision_cache_put
+
 
 # === HELPER FUNCTIONS ===
 
+@lru_cache(maxsize=32)
+def _b64_cached(path: str, mtime_ns: int, size: int) -> str:
+    """
+    Read + base64-encode a file, cached by (path, mtime, size).
+
+    The stat triple changes whenever the file content does, so a hit
+    is safe without hashing the bytes; mtime_ns/size are only cache-key
+    ingredients. "ascii" decode is correct (base64 output is pure
+    ASCII) and skips utf-8's multibyte handling.
+    """
+    with open(path, "rb") as f:
+        return base64.b64encode(f.read()).decode("ascii")
+
+
 def encode_image_to_base64(image_path: str) -> str:
     """
     Encode an image file to base64 string.
 
+    Multi-turn conversations re-send the same frame on every VLM turn;
+    caching on the file's stat signature turns the repeat encodes of a
+    multi-MB image into dict lookups.
+
     Args:
         image_path: Path to the image file
 
@@ -50,11 +73,12 @@ def encode_image_to_base64(image_path: str) -> str:
     """
     path = Path(image_path)
 
-    if not path.exists():
+    try:
+        st = path.stat()
+    except FileNotFoundError:
         raise FileNotFoundError(f"Image not found: {image_path}")
 
-    with open(path, "rb") as f:
-        return base64.b64encode(f.read()).decode("utf-8")
+    return _b64_cached(str(path), st.st_mtime_ns, st.st_size)
 
 
 def get_mime_type(file_path: str) -> str:
@@ -87,23 +111,67 @@ def call_groq_vision(image_path: str, prompt: str, model: str = None) -> dict:
     Returns:
         dict with response and metadata
     """
-    start_time = time.time()
+    # Read the image ONCE: the same bytes feed both the cache key and
+    # the base64 payload
+    path = Path(image_path)
+    if not path.exists():
+        raise FileNotFoundError(f"Image not found: {image_path}")
 
-    # Get the Groq client
-    client = get_groq_client()
+    return call_groq_vision_bytes(
+        path.read_bytes(),
+        prompt,
+        model=model,
+        mime_type=get_mime_type(image_path),
+    )
 
-    # Encode image
-    image_base64 = encode_image_to_base64(image_path)
-    mime_type = get_mime_type(image_path)
 
-    # Create data URL
-    data_url = f"data:{mime_type};base64,{image_base64}"
+def call_groq_vision_bytes(
+    image_bytes: bytes,
+    prompt: str,
+    model: str = None,
+    mime_type: str = "image/jpeg",
+) -> dict:
+    """
+    Call Groq Vision API with raw image bytes (cache-aware core).
+
+    Used by call_groq_vision (single file) and analyze_frame_batch
+    (tiled grid built in memory - no temp file needed).
+
+    Args:
+        image_bytes: Encoded image data (jpeg/png/...)
+        prompt: The prompt/question for the vision model
+        model: Vision model to use (default: llama-4-scout for speed)
+        mime_type: MIME type matching image_bytes encoding
+
+    Returns:
+        dict with response and metadata
+    """
+    start_time = time.time()
 
     # Select model - Llama 4 models support native vision
     # Scout: faster (~460 tok/s), Maverick: more capable
     if model is None:
         model = "meta-llama/llama-4-scout-17b-16e-instruct"  # Fast multimodal
 
+    # Cache hit: same frame + same prompt + same model was already
+    # analyzed this process - skip the vision tower entirely
+    cache_key = make_cache_key(image_bytes, prompt, model)
+    cached = vision_cache_get(cache_key)
+    if cached is not None:
+        result = dict(cached)
+        result["latency_ms"] = int((time.time() - start_time) * 1000)
+        result["cached"] = True
+        return result
+
+    # Get the Groq client
+    client = get_groq_client()
+
+    # Encode image ("ascii" decode: base64 output never leaves ASCII)
+    image_base64 = base64.b64encode(image_bytes).decode("ascii")
+
+    # Create data URL
+    data_url = f"data:{mime_type};base64,{image_base64}"
+
     # Call Groq Vision API
     response = client.chat.completions.create(
         model=model,
@@ -130,7 +198,7 @@ def call_groq_vision(image_path: str, prompt: str, model: str = None) -> dict:
 
     latency_ms = int((time.time() - start_time) * 1000)
 
-    return {
+    result = {
         "response": response.choices[0].message.content,
         "model": model,
         "latency_ms": latency_ms,
@@ -141,6 +209,11 @@ def call_groq_vision(image_path: str, prompt: str, model: str = None) -> dict:
         }
     }
 
+    # Store for later turns that re-ask about the same frame
+    vision_cache_put(cache_key, result)
+
+    return result
+
 
 # === VISION TOOLS ===
 
@@ -417,6 +490,122 @@ Provide a clear, concise answer. If the question is yes/no, start with Yes or No
         })
 
 
+# Maximum frames per batched call (4x4 grid keeps tiles legible for the
+# vision model while amortizing one ~50ms round-trip over all of them)
+MAX_BATCH_FRAMES = 16
+
+
+def tile_frames_to_jpeg(image_paths: List[str]) -> bytes:
+    """
+    Paste up to MAX_BATCH_FRAMES images into one numbered grid (JPEG bytes).
+
+    Frames are resized to the first frame's dimensions and arranged
+    row-major in a near-square grid, so one vision call can report on
+    every tile by index.
+    """
+    import io
+    from PIL import Image
+
+    images = [Image.open(p).convert("RGB") for p in image_paths]
+
+    # Normalize to the first frame's size so the grid is uniform
+    tile_w, tile_h = images[0].size
+    cols = math.ceil(math.sqrt(len(images)))
+    rows = math.ceil(len(images) / cols)
+
+    grid = Image.new("RGB", (tile_w * cols, tile_h * rows))
+    for i, img in enumerate(images):
+        if img.size != (tile_w, tile_h):
+            img = img.resize((tile_w, tile_h))
+        grid.paste(img, ((i % cols) * tile_w, (i // cols) * tile_h))
+
+    buffer = io.BytesIO()
+    grid.save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+
+@tool
+def analyze_frame_batch(image_paths: List[str], prompt: Optional[str] = None) -> str:
+    """
+    Analyze MULTIPLE frames/images in ONE Groq vision call.
+
+    Use this tool instead of calling analyze_image repeatedly when you
+    have several frames from the same video or several related images.
+    The frames are tiled into a single grid image, so one ~50ms API
+    round-trip covers all of them instead of one round-trip per frame.
+
+    Ideal for:
+    - Sampled video frames (e.g. from 1 fps extraction)
+    - Before/after comparisons
+    - Multi-angle views of the same scene
+
+    Args:
+        image_paths: List of image file paths (max 16 per call)
+        prompt: Optional analysis prompt. If not provided, each frame
+                is described individually by its grid position.
+
+    Returns:
+        JSON string with:
+        - success: Whether the analysis succeeded
+        - frame_count: Number of frames analyzed
+        - analysis: Per-frame analysis (keyed by grid position)
+        - latency_ms: Response time for the whole batch
+        - model: The model used
+
+    Example:
+        >>> result = analyze_frame_batch(["frame_0.jpg", "frame_1.jpg"], "Is anyone present?")
+        >>> data = json.loads(result)
+        >>> print(data["analysis"])
+    """
+    try:
+        if not image_paths:
+            return json.dumps({
+                "success": False,
+                "error": "No image paths provided"
+            })
+
+        missing = [p for p in image_paths if not Path(p).exists()]
+        if missing:
+            return json.dumps({
+                "success": False,
+                "error": f"Images not found: {missing}"
+            })
+
+        batch = image_paths[:MAX_BATCH_FRAMES]
+        cols = math.ceil(math.sqrt(len(batch)))
+
+        if prompt is None:
+            prompt = "Analyze each frame. Note any changes or movement between frames."
+
+        # One grid image, one API call, one round-trip for the batch
+        grid_bytes = tile_frames_to_jpeg(batch)
+
+        grid_prompt = f"""This image is a grid of {len(batch)} video frames, \
+numbered row-by-row from 1 (top-left), {cols} per row.
+
+For each frame, answer: {prompt}
+
+Respond with one numbered entry per frame (Frame 1: ..., Frame 2: ...)."""
+
+        result = call_groq_vision_bytes(grid_bytes, grid_prompt)
+
+        return json.dumps({
+            "success": True,
+            "frame_count": len(batch),
+            "frames_processed": [str(p) for p in batch],
+            "analysis": result["response"],
+            "latency_ms": result["latency_ms"],
+            "model": result["model"],
+            "usage": result["usage"]
+        }, indent=2)
+
+    except Exception as e:
+        return json.dumps({
+            "success": False,
+            "error": str(e)
+        })
+
+
 # === UTILITY FUNCTIONS ===
 
 def check_groq_vision_status() -> dict:
@@ -439,6 +628,7 @@ VIDEO_TOOLS = [
     describe_scene,
     detect_objects,
     visual_question,
+    analyze_frame_batch,
 ]
 
 
@@ -0,0 +1,105 @@
+"""
+Vision Response Cache - Skip Repeated Groq Vision Calls
+
+Multi-turn conversations repeatedly send the SAME image through the
+vision model: the supervisor routes a follow-up question, the video
+agent re-runs its tool, and Groq recomputes the full vision tower for
+pixels it has already seen. That recomputation is pure waste.
+
+This module caches vision responses keyed by a hash of the ACTUAL image
+bytes (not the file path - the same frame saved twice, or a re-uploaded
+file, still hits) plus the prompt and model. On a hit the tool returns
+instantly with zero API cost.
+
+=== DESIGN ===
+
+- Key: blake2b(image_bytes, 16 bytes) + prompt + model. blake2b hashes
+  ~1 GB/s in pure stdlib, so keying a 1 MB frame costs ~1ms vs a ~50ms
+  round-trip.
+- Store: OrderedDict used as an LRU, capped so memory stays bounded
+  (responses are small text dicts, not embeddings).
+- Scope: process-global, like the client singletons in src/clients/.
+
+Usage:
+    from src.tools.vision_cache import make_cache_key, vision_cache_get, vision_cache_put
+
+    key = make_cache_key(image_bytes, prompt, model)
+    cached = vision_cache_get(key)
+    if cached is None:
+        result = ...  # call the vision API
+        vision_cache_put(key, result)
+"""
+
+import hashlib
+from collections import OrderedDict
+
+
+# Maximum number of cached responses. Entries are small (a few KB of
+# response text each), so this bounds memory at roughly a few MB.
+_MAX_ENTRIES = 256
+
+# LRU store: most-recently-used entries live at the end
+_cache: "OrderedDict[str, dict]" = OrderedDict()
+
+# Hit/miss counters for observability (surfaced via cache_stats())
+_hits = 0
+_misses = 0
+
+
+def make_cache_key(image_bytes: bytes, prompt: str, model: str) -> str:
+    """
+    Build a cache key from image content, prompt, and model.
+
+    Hashing the bytes (not the path) means identical frames hit the
+    cache regardless of where they were saved.
+    """
+    digest = hashlib.blake2b(image_bytes, digest_size=16)
+    digest.update(prompt.encode("utf-8"))
+    digest.update(model.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def vision_cache_get(key: str):
+    """
+    Look up a cached vision response.
+
+    Returns the cached dict (marking the entry most-recently-used), or
+    None on a miss.
+    """
+    global _hits, _misses
+
+    cached = _cache.get(key)
+    if cached is None:
+        _misses += 1
+        return None
+
+    _cache.move_to_end(key)
+    _hits += 1
+    return cached
+
+
+def vision_cache_put(key: str, value: dict) -> None:
+    """Store a vision response, evicting the least-recently-used entry."""
+    _cache[key] = value
+    _cache.move_to_end(key)
+
+    if len(_cache) > _MAX_ENTRIES:
+        _cache.popitem(last=False)
+
+
+def cache_stats() -> dict:
+    """Get hit/miss counts and current size (for health/debug output)."""
+    return {
+        "entries": len(_cache),
+        "max_entries": _MAX_ENTRIES,
+        "hits": _hits,
+        "misses": _misses,
+    }
+
+
+def clear_vision_cache() -> None:
+    """Clear all cached responses and reset counters (for testing)."""
+    global _hits, _misses
+    _cache.clear()
+    _hits = 0
+    _misses = 0
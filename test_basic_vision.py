@@ -0,0 +1,184 @@
+"""
+Test script for the basic vision tools (local, no API keys needed).
+
+This script tests:
+1. analyze_image_colors succeeds and reports sane values
+2. detect_image_quality_issues succeeds on a real image
+3. get_image_info reads metadata
+
+Everything here runs locally (NumPy/PIL/OpenCV) - no LLM calls, so it
+can run in CI without credentials.
+
+Run: python test_basic_vision.py
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+
+def create_test_image():
+    """Create a synthetic image with a known dominant color."""
+    from PIL import Image, ImageDraw
+
+    # Mostly red with a white stripe: dominant color and brightness
+    # are both predictable
+    img = Image.new('RGB', (800, 600), color=(200, 30, 30))
+    draw = ImageDraw.Draw(img)
+    draw.rectangle([0, 0, 800, 100], fill=(255, 255, 255))
+
+    test_path = project_root / "test_images" / "test_colors.png"
+    test_path.parent.mkdir(exist_ok=True)
+    img.save(test_path)
+
+    print(f"Created test image at: {test_path}")
+    return test_path
+
+
+def test_analyze_image_colors(image_path: Path):
+    """Test 1: Color analysis succeeds with sane brightness."""
+    print("\n" + "=" * 60)
+    print("TEST 1: analyze_image_colors")
+    print("=" * 60)
+
+    try:
+        from src.tools.basic_vision_tools import analyze_image_colors
+
+        result = analyze_image_colors.invoke({"image_path": str(image_path)})
+        data = json.loads(result)
+
+        print(f"success: {data.get('success')}")
+        if not data.get("success"):
+            print(f"FAILED: tool returned error: {data.get('error')}")
+            return False
+
+        brightness = data["brightness"]
+        colors = data["dominant_colors"]
+        print(f"brightness: {brightness}")
+        print(f"top color: {colors[0]}")
+
+        # Brightness must be a sane scalar in gray-level range
+        if not (0.0 <= brightness <= 255.0):
+            print(f"FAILED: brightness {brightness} outside 0-255")
+            return False
+
+        # The synthetic image is 5/6 red - the top color must be red-ish
+        r, g, b = colors[0]["rgb"]
+        if not (r > g and r > b):
+            print(f"FAILED: expected a red dominant color, got {colors[0]['rgb']}")
+            return False
+
+        print("PASSED: color analysis works!")
+        return True
+
+    except Exception as e:
+        print(f"FAILED: {type(e).__name__}: {e}")
+        return False
+
+
+def test_detect_image_quality(image_path: Path):
+    """Test 2: Quality check succeeds and reports all fields."""
+    print("\n" + "=" * 60)
+    print("TEST 2: detect_image_quality_issues")
+    print("=" * 60)
+
+    try:
+        from src.tools.basic_vision_tools import detect_image_quality_issues
+
+        result = detect_image_quality_issues.invoke({"image_path": str(image_path)})
+        data = json.loads(result)
+
+        print(f"success: {data.get('success')}")
+        if not data.get("success"):
+            print(f"FAILED: tool returned error: {data.get('error')}")
+            return False
+
+        # 800x600 is above the VGA floor, so the full checks must run
+        for field in ("blur_score", "brightness", "contrast", "is_low_resolution"):
+            if field not in data:
+                print(f"FAILED: missing field {field}")
+                return False
+        if data["is_low_resolution"]:
+            print("FAILED: 800x600 flagged as low resolution")
+            return False
+
+        print(f"blur_score: {data['blur_score']}, brightness: {data['brightness']}")
+        print("PASSED: quality check works!")
+        return True
+
+    except Exception as e:
+        print(f"FAILED: {type(e).__name__}: {e}")
+        return False
+
+
+def test_get_image_info(image_path: Path):
+    """Test 3: Metadata reading."""
+    print("\n" + "=" * 60)
+    print("TEST 3: get_image_info")
+    print("=" * 60)
+
+    try:
+        from src.tools.basic_vision_tools import get_image_info
+
+        result = get_image_info.invoke({"image_path": str(image_path)})
+        data = json.loads(result)
+
+        print(f"success: {data.get('success')}")
+        if not data.get("success"):
+            print(f"FAILED: tool returned error: {data.get('error')}")
+            return False
+
+        if (data["width"], data["height"]) != (800, 600):
+            print(f"FAILED: expected 800x600, got {data['width']}x{data['height']}")
+            return False
+
+        print(f"format: {data['format']}, size: {data['file_size_bytes']} bytes")
+        print("PASSED: image info works!")
+        return True
+
+    except Exception as e:
+        print(f"FAILED: {type(e).__name__}: {e}")
+        return False
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("BASIC VISION TOOLS TEST (local, no API keys)")
+    print("=" * 60)
+
+    test_image = create_test_image()
+
+    results = [
+        ("Colors", test_analyze_image_colors(test_image)),
+        ("Quality", test_detect_image_quality(test_image)),
+        ("Info", test_get_image_info(test_image)),
+    ]
+
+    # Summary
+    print("\n" + "=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+
+    all_passed = True
+    for name, passed in results:
+        status = "PASSED" if passed else "FAILED"
+        print(f"  {name}: {status}")
+        if not passed:
+            all_passed = False
+
+    print("=" * 60)
+    if all_passed:
+        print("All tests passed! Basic vision tools are working correctly.")
+    else:
+        print("Some tests failed. Please check the errors above.")
+
+    return 0 if all_passed else 1
+
+
+if __name__ == "__main__":
+    exit(main())